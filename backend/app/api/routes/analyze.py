@@ -1,11 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form
+from fastapi.responses import StreamingResponse
 from typing import Optional
 
-from app.schemas.analyze_schema import AnalyzeRequest, AnalyzeImageRequest, AnalyzeResponse
+from app.schemas.analyze_schema import (
+    AnalyzeRequest,
+    AnalyzeImageRequest,
+    AnalyzeResponse,
+    MathematicalModel,
+)
 from app.services.analyze_service import AnalyzeService
+from app.services.problem_transformer import ProblemTransformer
 from app.services.solver_service import SolverService
 from app.core.config import settings
 from app.core.logger import logger
+from app.utils.json_utils import generate_ndjson
 from app.api.docs import (
     ANALYZE_ENDPOINT_DOC,
     VALIDATE_MODEL_ENDPOINT_DOC,
@@ -72,16 +80,8 @@ async def analyze_problem(request: AnalyzeRequest) -> AnalyzeResponse:
                 detail="Error al procesar el problema",
             )
         
-        # Validar modelo con SymPy
-        is_valid = service.validate_model_with_sympy(response.mathematical_model)
-        if not is_valid:
-            logger.warning("Modelo no validado por SymPy, pero se retorna igualmente")
-        
-        # Generar todas las representaciones del problema
-        representations_dict = service.get_problem_representations()
-        if representations_dict:
-            from app.schemas.analyze_schema import ProblemRepresentations
-            response.representations = ProblemRepresentations(**representations_dict)
+        # Validar modelo con SymPy y generar todas las representaciones del problema
+        service.finalize(response)
         
         logger.info("Análisis completado exitosamente")
         return response
@@ -103,15 +103,13 @@ async def analyze_problem(request: AnalyzeRequest) -> AnalyzeResponse:
 async def validate_model(model: dict) -> dict:
     """Validar Modelo Matemático con SymPy"""
     try:
-        from app.schemas.analyze_schema import MathematicalModel
         
         math_model = MathematicalModel(**model)
         
-        # Usar un servicio temporal para validar
-        service = AnalyzeService(groq_api_key="dummy")
-        is_valid = service.validate_model_with_sympy(math_model)
+        # La validación no usa el cliente Groq: métodos estáticos, sin instancia ni API key
+        is_valid = AnalyzeService.validate_model_with_sympy(math_model)
         
-        sympy_expressions = service.generate_sympy_expression(math_model)
+        sympy_expressions = AnalyzeService.generate_sympy_expression(math_model)
         
         return {
             "is_valid": is_valid,
@@ -134,7 +132,6 @@ async def validate_model(model: dict) -> dict:
 async def get_representations(model: dict) -> dict:
     """Generar Todas las Representaciones de un Modelo"""
     try:
-        from app.services.problem_transformer import ProblemTransformer
         
         transformer = ProblemTransformer(model)
         representations = transformer.get_all_representations()
@@ -162,7 +159,7 @@ async def solve_model(payload: dict) -> dict:
 
     payload debe contener:
     - model: dict (estructura de MathematicalModel)
-    - method: str (opcional, uno de: 'simplex','graphical','dual','big_m')
+    - method: str (opcional, uno de SolverService.SUPPORTED_METHODS: 'simplex','graphical','dual_simplex','big_m','interior_point')
     """
     try:
         model = payload.get("model")
@@ -170,11 +167,16 @@ async def solve_model(payload: dict) -> dict:
 
         if not model:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Falta campo 'model' en payload")
+        # Mismo rechazo que la vista Django: un método desconocido es un error del cliente
+        if method not in SolverService.SUPPORTED_METHODS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Método no soportado: {method}. Métodos disponibles: {', '.join(SolverService.SUPPORTED_METHODS)}",
+            )
 
         service = SolverService()
-        from app.schemas.analyze_schema import MathematicalModel as MM
 
-        mm = MM(**model)
+        mm = MathematicalModel(**model)
 
         result = service.solve(mm, method=method)
         return {"success": True, "result": result}
@@ -186,6 +188,31 @@ async def solve_model(payload: dict) -> dict:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 
+@router.post(
+    "/solve-stream",
+    description="Resuelve con Simplex Tableau emitiendo cada iteración como NDJSON (init, iter..., final)."
+)
+async def solve_model_stream(payload: dict) -> StreamingResponse:
+    """Resuelve un modelo de maximización con Simplex Tableau enviando las tablas a medida que se calculan."""
+    model = payload.get("model")
+    if not model:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Falta campo 'model' en payload")
+
+    try:
+        mm = MathematicalModel(**model)
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if mm.objective == "min":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El streaming de iteraciones solo está disponible para el Método Simplex (maximización).",
+        )
+
+    stream = SolverService().solve_simplex_stream(mm)
+    return StreamingResponse(generate_ndjson(stream), media_type="application/x-ndjson")
+
+
 @router.post(
     "/analyze-image", 
     response_model=AnalyzeResponse, 
@@ -211,10 +238,7 @@ async def analyze_problem_from_image(
                 detail="API key requerida",
             )
         
-        # Leer contenido de la imagen
-        image_content = await file.read()
-        
-        # Validar que sea una imagen
+        # Validar que sea una imagen antes de tocar el contenido subido
         if not file.content_type or not file.content_type.startswith("image/"):
             logger.error(f"Tipo de archivo no válido: {file.content_type}")
             raise HTTPException(
@@ -227,7 +251,7 @@ async def analyze_problem_from_image(
         
         # Analizar imagen (SIEMPRE usa modelo de visión, nunca el groq_model del usuario)
         response = service.analyze_problem_from_image(
-            image_data=image_content,
+            image_data=file.file,
             problem_description=problem_description,
             groq_model=None,  # Ignorar groq_model - siempre usar GROQ_VISION_MODEL
             prompt_name="basic",
@@ -240,16 +264,8 @@ async def analyze_problem_from_image(
                 detail="Error al procesar la imagen",
             )
         
-        # Validar modelo con SymPy
-        is_valid = service.validate_model_with_sympy(response.mathematical_model)
-        if not is_valid:
-            logger.warning("Modelo no validado por SymPy, pero se retorna igualmente")
-        
-        # Generar todas las representaciones del problema
-        representations_dict = service.get_problem_representations()
-        if representations_dict:
-            from app.schemas.analyze_schema import ProblemRepresentations
-            response.representations = ProblemRepresentations(**representations_dict)
+        # Validar modelo con SymPy y generar todas las representaciones del problema
+        service.finalize(response)
         
         logger.info("Análisis desde imagen completado exitosamente")
         return response
@@ -1,18 +1,25 @@
 import base64
 import json
+from functools import lru_cache
 from typing import Optional, List, Union, Dict, Any, BinaryIO
 from groq import Groq
 from app.core.logger import logger
 from app.core.config import settings
 
 
+@lru_cache(maxsize=8)
+def _shared_groq(api_key: str) -> Groq:
+    """Cliente Groq por API key, compartido para reutilizar su pool de conexiones HTTP (keep-alive)."""
+    return Groq(api_key=api_key)
+
+
 class GroqClient:
     """Cliente para la API de Groq con soporte para texto, imágenes y prompts de sistema."""
 
     def __init__(self, api_key: str, model: Optional[str] = None):
         self.api_key = api_key
         self.model = model or settings.GROQ_MODEL
-        self.client = Groq(api_key=api_key)
+        self.client = _shared_groq(api_key)
         self.system_prompt: Optional[str] = None
 
     # ------------------------------------------------------------------------
@@ -32,6 +39,9 @@ class GroqClient:
             if isinstance(file, bytes):
                 content = file
             else:
+                # Rebobinar permite reintentar con el modelo fallback sobre el mismo archivo
+                if file.seekable():
+                    file.seek(0)
                 content = file.read()
             return base64.b64encode(content).decode("utf-8")
         except Exception as e:
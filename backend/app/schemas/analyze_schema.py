@@ -116,6 +116,7 @@ class MathematicalModel(BaseModel):
     variables: Dict[str, str] = Field(default_factory=dict, description="Variables de decisión con sus descripciones (ej: {'x1': 'Unidades producto A', 'x2': 'Unidades producto B'})")
     objective: str = Field(default="max", description="Objetivo: 'max' para maximizar o 'min' para minimizar")
     context: str = Field(default="", description="Contexto resumido del problema para posterior análisis con IA")
+    metadata: Dict[str, Any] = Field(default_factory=dict, description="Opciones de resolución (ej: {'force_didactic': True} para mantener el tableau en problemas grandes, {'sparse_revised': True} para el simplex revisado disperso)")
     
     class Config:
         json_schema_extra = {
@@ -1,12 +1,12 @@
 import json
 import re
-from typing import Optional, Dict
+from typing import Optional, Dict, Union, BinaryIO
 import sympy as sp
 
 from app.core.logger import logger
 from app.core.config import settings
 from app.core.groq_client import GroqClient
-from app.schemas.analyze_schema import MathematicalModel, AnalyzeResponse
+from app.schemas.analyze_schema import MathematicalModel, AnalyzeResponse, ProblemRepresentations
 from app.services.problem_processor import ProblemProcessor
 from app.services.problem_transformer import ProblemTransformer
 from app.services.solver_service import SolverService
@@ -187,7 +187,8 @@ class AnalyzeService:
                 context="",
             )
 
-    def validate_model_with_sympy(self, model: MathematicalModel) -> bool:
+    @staticmethod
+    def validate_model_with_sympy(model: MathematicalModel) -> bool:
         """
         Valida el modelo matemático usando SymPy.
         
@@ -220,7 +221,8 @@ class AnalyzeService:
             logger.error(f"Error al validar modelo con SymPy: {str(e)}")
             return False
 
-    def generate_sympy_expression(self, model: MathematicalModel) -> Optional[dict]:
+    @staticmethod
+    def generate_sympy_expression(model: MathematicalModel) -> Optional[dict]:
         """
         Genera expresiones SymPy para el modelo matemático.
         
@@ -275,9 +277,27 @@ class AnalyzeService:
             logger.error(f"Error generando representaciones: {str(e)}")
             return None
 
+    def finalize(self, response: AnalyzeResponse) -> bool:
+        """
+        Cierra el análisis: valida el modelo y adjunta sus representaciones a la respuesta.
+        
+        Args:
+            response: Respuesta de analyze_problem / analyze_problem_from_image (se modifica in situ)
+            
+        Returns:
+            True si el modelo pasó la validación con SymPy
+        """
+        is_valid = self.validate_model_with_sympy(response.mathematical_model)
+        if not is_valid:
+            logger.warning("Modelo no validado por SymPy, pero se retorna igualmente")
+        representations_dict = self.get_problem_representations()
+        if representations_dict:
+            response.representations = ProblemRepresentations(**representations_dict)
+        return is_valid
+
     def analyze_problem_from_image(
         self,
-        image_data: bytes,
+        image_data: Union[bytes, BinaryIO],
         problem_description: Optional[str] = None,
         groq_model: Optional[str] = None,
         prompt_name: str = "basic",
@@ -286,7 +306,7 @@ class AnalyzeService:
         Analiza un problema desde una imagen usando Groq vision.
         
         Args:
-            image_data: Bytes de la imagen
+            image_data: Bytes de la imagen o archivo binario abierto (se lee solo al codificar)
             problem_description: Descripción adicional del problema (opcional)
             groq_model: Modelo de Groq a usar
             prompt_name: Nombre del prompt ("basic", "detailed", etc.)
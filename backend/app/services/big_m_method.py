@@ -13,12 +13,12 @@ CORRECCIONES REALIZADAS:
 """
 
 from typing import Dict, List, Optional, Tuple, Any
-import sympy as sp
 import numpy as np
 from dataclasses import dataclass
 import json
 
 from app.core.logger import logger
+from app.services.expression_utils import is_nonnegativity_bound, linear_coefficients, linear_constraint
 from app.schemas.analyze_schema import MathematicalModel
 
 
@@ -86,12 +86,8 @@ class BigMMethod:
             is_max = model.objective == "max"
             self.is_max = is_max  # Guardar para usarlo en la visualización
             
-            # Crear símbolos SymPy
-            symbols = {name: sp.Symbol(name, real=True, positive=True) for name in var_names}
-            
             # Parsear función objetivo
-            obj_expr = sp.sympify(model.objective_function, locals=symbols)
-            c = np.array([float(obj_expr.coeff(symbols[v], 1) or 0) for v in var_names])
+            c = np.array(linear_coefficients(model.objective_function, tuple(var_names))[0])
             
             # Para minimización, se multiplica por -1 (convertir a maximización)
             if not is_max:
@@ -99,7 +95,7 @@ class BigMMethod:
             
             # Parsear restricciones
             constraints_data = self._parse_constraints(
-                model.constraints or [], var_names, symbols
+                model.constraints or [], var_names
             )
             
             if not constraints_data:
@@ -220,8 +216,7 @@ class BigMMethod:
     def _parse_constraints(
         self,
         constraints: List[str],
-        var_names: List[str],
-        symbols: Dict
+        var_names: List[str]
     ) -> List[Tuple[np.ndarray, str, float]]:
         """
         Parsea restricciones y retorna lista de (coeficientes, operador, RHS).
@@ -233,60 +228,19 @@ class BigMMethod:
         for constraint_str in constraints:
             constraint_str = constraint_str.strip()
             
-            # Filtrar restricciones de no-negatividad (exactamente "xi >= 0" o "xi <= 0")
-            # Usamos una verificación más precisa para evitar falsos positivos
-            is_nonnegativity = False
-            for v in var_names:
-                # Verificar si es exactamente "v >= 0" o "v <= 0" (con posibles espacios)
-                import re
-                pattern_ge = rf'^{re.escape(v)}\s*>=\s*0$'
-                pattern_le = rf'^{re.escape(v)}\s*<=\s*0$'
-                if re.match(pattern_ge, constraint_str) or re.match(pattern_le, constraint_str):
-                    is_nonnegativity = True
-                    break
-            
-            if is_nonnegativity:
+            # Filtrar cotas de no-negatividad ("xi >= 0"); "xi <= 0" es una restricción real
+            if is_nonnegativity_bound(constraint_str, var_names):
                 continue
             
-            try:
-                # Parsear: "2*x1 + x2 <= 10" o "x1 <= 3*x2"
-                parts = None
-                for op in ["<=", ">=", "="]:
-                    if op in constraint_str:
-                        left, right = constraint_str.split(op, 1)
-                        parts = (left.strip(), op, right.strip())
-                        break
-                
-                if not parts:
-                    continue
-                
-                lhs_str, op, rhs_str = parts
-                lhs_expr = sp.sympify(lhs_str, locals=symbols)
-                rhs_expr = sp.sympify(rhs_str, locals=symbols)
-                
-                # Mover todo al lado izquierdo: LHS - RHS <= 0 (o >= 0, o = 0)
-                # Esto maneja casos como x1 <= 3*x2 -> x1 - 3*x2 <= 0
-                combined_expr = lhs_expr - rhs_expr
-                
-                # Extraer coeficientes de la expresión combinada
-                coeffs = np.array([
-                    float(combined_expr.coeff(symbols[v], 1) or 0)
-                    for v in var_names
-                ])
-                
-                # El RHS ahora es el término constante negado
-                # combined_expr = ax + by + ... + constant, queremos ax + by + ... <= -constant
-                # Entonces rhs_val = -constant
-                constant_term = float(combined_expr.as_coeff_add()[0]) if combined_expr.is_Add else 0
-                # Obtener el término independiente correctamente
-                constant_term = float(combined_expr.subs({symbols[v]: 0 for v in var_names}))
-                rhs_val = -constant_term
-                
-                constraints_data.append((coeffs, op, rhs_val))
-                
-            except Exception as e:
-                logger.warning(f"Error parseando restricción '{constraint_str}': {e}")
+            # Parsear: "2*x1 + x2 <= 10" o "x1 <= 3*x2" (todo se mueve al lado izquierdo)
+            # Una restricción no lineal o ilegible lanza ValueError: se reporta, no se descarta
+            parsed = linear_constraint(constraint_str, tuple(var_names))
+            
+            if not parsed:
                 continue
+            
+            coeffs, op, rhs_val = parsed
+            constraints_data.append((np.array(coeffs), op, rhs_val))
         
         return constraints_data
     
@@ -452,17 +406,13 @@ class BigMMethod:
         col = tableau[:-1, entering_col]
         rhs = tableau[:-1, -1]
         
-        min_ratio = float('inf')
-        min_row = None
-        
-        for i in range(len(col)):
-            if col[i] > self._TOL:  # Solo para coeficientes POSITIVOS
-                ratio = rhs[i] / col[i]
-                if 0 <= ratio < min_ratio:  # Ratio no negativo
-                    min_ratio = ratio
-                    min_row = i
+        # Razones sólo para coeficientes POSITIVOS y con resultado no negativo
+        ratios = np.full(len(col), np.inf)
+        np.divide(rhs, col, out=ratios, where=col > self._TOL)
+        ratios[ratios < 0] = np.inf
         
-        return min_row
+        min_row = int(np.argmin(ratios))
+        return min_row if np.isfinite(ratios[min_row]) else None
     
     def _pivot_in_place(self, tableau: np.ndarray, pivot_row: int, pivot_col: int) -> None:
         """
@@ -474,11 +424,11 @@ class BigMMethod:
         # Dividir fila pivote
         tableau[pivot_row] = tableau[pivot_row] / pivot_element
         
-        # Eliminar otros elementos en la columna
-        for i in range(len(tableau)):
-            if i != pivot_row and abs(tableau[i, pivot_col]) > self._TOL:
-                factor = tableau[i, pivot_col]
-                tableau[i] = tableau[i] - factor * tableau[pivot_row]
+        # Eliminar otros elementos en la columna (actualización de rango 1 en un solo paso)
+        factors = tableau[:, pivot_col].copy()
+        factors[pivot_row] = 0.0
+        factors[np.abs(factors) <= self._TOL] = 0.0
+        tableau -= np.outer(factors, tableau[pivot_row])
     
     def _get_variable_name_from_col(self, col: int) -> str:
         """
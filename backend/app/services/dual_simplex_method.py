@@ -14,12 +14,12 @@ Características:
 """
 
 from typing import Dict, List, Optional, Tuple, Any
-import sympy as sp
 import numpy as np
 from dataclasses import dataclass
 import json
 
 from app.core.logger import logger
+from app.services.expression_utils import is_nonnegativity_bound, linear_coefficients, linear_constraint
 from app.schemas.analyze_schema import MathematicalModel
 
 
@@ -95,16 +95,12 @@ class DualSimplexMethod:
             var_names = list(model.variables.keys())
             n_vars = len(var_names)
             
-            # Crear símbolos SymPy
-            symbols = {name: sp.Symbol(name, real=True, positive=True) for name in var_names}
-            
             # Parsear función objetivo
-            obj_expr = sp.sympify(model.objective_function, locals=symbols)
-            c = np.array([float(obj_expr.coeff(symbols[v], 1) or 0) for v in var_names])
+            c = np.array(linear_coefficients(model.objective_function, tuple(var_names))[0])
             
             # Parsear restricciones (esperamos restricciones >=)
             constraints_data = self._parse_constraints(
-                model.constraints or [], var_names, symbols
+                model.constraints or [], var_names
             )
             
             if not constraints_data:
@@ -227,8 +223,7 @@ class DualSimplexMethod:
     def _parse_constraints(
         self,
         constraints: List[str],
-        var_names: List[str],
-        symbols: Dict
+        var_names: List[str]
     ) -> List[Tuple[np.ndarray, str, float]]:
         """
         Parsea restricciones y retorna lista de (coeficientes, operador, RHS).
@@ -239,38 +234,19 @@ class DualSimplexMethod:
         for constraint_str in constraints:
             constraint_str = constraint_str.strip()
             
-            # Filtrar restricciones de no-negatividad
-            if any(f"{v} >= 0" in constraint_str or f"{v} <= 0" in constraint_str 
-                   for v in var_names):
+            # Filtrar cotas de no-negatividad ("xi >= 0"); "xi <= 0" es una restricción real
+            if is_nonnegativity_bound(constraint_str, var_names):
                 continue
             
-            try:
-                # Parsear: "2*x1 + x2 >= 10" o "2*x1 + x2 <= 10"
-                parts = None
-                for op in ["<=", ">=", "="]:
-                    if op in constraint_str:
-                        left, right = constraint_str.split(op, 1)
-                        parts = (left.strip(), op, right.strip())
-                        break
-                
-                if not parts:
-                    continue
-                
-                lhs_str, op, rhs_str = parts
-                lhs_expr = sp.sympify(lhs_str, locals=symbols)
-                rhs_val = float(sp.sympify(rhs_str))
-                
-                # Extraer coeficientes
-                coeffs = np.array([
-                    float(lhs_expr.coeff(symbols[v], 1) or 0)
-                    for v in var_names
-                ])
-                
-                constraints_data.append((coeffs, op, rhs_val))
-                
-            except Exception as e:
-                logger.warning(f"Error parseando restricción '{constraint_str}': {e}")
+            # Parsear: "2*x1 + x2 >= 10" o "2*x1 + x2 <= 10" (coeficientes memoizados por texto)
+            # Una restricción no lineal o ilegible lanza ValueError: se reporta, no se descarta
+            parsed = linear_constraint(constraint_str, tuple(var_names))
+            
+            if not parsed:
                 continue
+            
+            coeffs, op, rhs_val = parsed
+            constraints_data.append((np.array(coeffs), op, rhs_val))
         
         return constraints_data
     
@@ -516,11 +492,11 @@ class DualSimplexMethod:
         # Dividir fila pivote por el elemento pivote
         tableau[pivot_row] = tableau[pivot_row] / pivot_element
         
-        # Eliminar elementos en la columna pivote de otras filas
-        for i in range(len(tableau)):
-            if i != pivot_row and abs(tableau[i, pivot_col]) > self._TOL:
-                factor = tableau[i, pivot_col]
-                tableau[i] = tableau[i] - factor * tableau[pivot_row]
+        # Eliminar elementos en la columna pivote de otras filas (actualización de rango 1 en un solo paso)
+        factors = tableau[:, pivot_col].copy()
+        factors[pivot_row] = 0.0
+        factors[np.abs(factors) <= self._TOL] = 0.0
+        tableau -= np.outer(factors, tableau[pivot_row])
     
     def _get_variable_name_from_col(self, col: int) -> str:
         """
@@ -9,9 +9,16 @@ Genera tablas Simplex con:
 - Variables de holgura resaltadas
 """
 
+import hashlib
 from typing import Dict, List, Any, Optional
 import numpy as np
 
+from app.utils.json_utils import dumps
+
+# HTML ya generado por huella de los pasos: resolver de nuevo el mismo modelo no vuelve a armarlo
+_HTML_CACHE: Dict[str, str] = {}
+_HTML_CACHE_MAX = 64
+
 
 class DualSimplexVisualizer:
     """Generador de visualizaciones para el método Simplex Dual."""
@@ -39,6 +46,11 @@ class DualSimplexVisualizer:
         Returns:
             String HTML con la visualización completa
         """
+        key = hashlib.blake2b(dumps(steps).encode("utf-8"), digest_size=16).hexdigest()
+        cached = _HTML_CACHE.get(key)
+        if cached is not None:
+            return cached
+        
         html_parts = [self._generate_html_header()]
         
         for step in steps:
@@ -46,7 +58,12 @@ class DualSimplexVisualizer:
         
         html_parts.append(self._generate_html_footer())
         
-        return "\n".join(html_parts)
+        html = "\n".join(html_parts)
+        if len(_HTML_CACHE) >= _HTML_CACHE_MAX:
+            # Se descarta la entrada más antigua (los dicts conservan el orden de inserción)
+            _HTML_CACHE.pop(next(iter(_HTML_CACHE)), None)
+        _HTML_CACHE[key] = html
+        return html
     
     def _generate_html_header(self) -> str:
         """Genera el encabezado HTML con estilos CSS."""
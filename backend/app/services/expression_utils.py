@@ -4,8 +4,186 @@ Utilidades para manipulación y normalización de expresiones algebraicas.
 
 import re
 import ast
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+import sympy as sp
 from app.core.logger import logger
 
+try:
+    import symengine as se
+except Exception:
+    se = None
+
+
+@lru_cache(maxsize=4096)
+def get_symbol(name: str) -> sp.Symbol:
+    """
+    Símbolo canónico (real, positivo) para una variable de decisión.
+    
+    Todas las partes del sistema comparten la misma instancia por nombre, de modo
+    que las cachés internas de SymPy (hash/igualdad, subs, Poly) se reutilizan.
+    
+    Args:
+        name: Nombre de la variable (ej. "x1")
+        
+    Returns:
+        Symbol(name, real=True, positive=True)
+    """
+    return sp.Symbol(name, real=True, positive=True)
+
+
+# Secuencias de operadores de relación; sólo las de _RELATIONS son válidas ('=>', '=<', '<', '!=' no)
+_RELATION_OP = re.compile(r'[<>=!]+')
+_RELATIONS = {"<=": "<=", ">=": ">=", "==": "=", "=": "="}
+
+
+def split_relation(constraint_str: str) -> Optional[Tuple[str, str, str]]:
+    """
+    Separa una restricción "lhs OP rhs" sin pasar por SymPy.
+    
+    Es el único tokenizador de relaciones: lo usan los solvers, la validación y el LaTeX.
+    
+    Args:
+        constraint_str: Restricción como string (ej. "2*x1 + x2 <= 10")
+        
+    Returns:
+        (lhs, operador, rhs) con el operador normalizado a "<=", ">=" o "=";
+        None si no hay exactamente un operador de relación válido
+    """
+    matches = _RELATION_OP.findall(constraint_str)
+    if len(matches) != 1 or matches[0] not in _RELATIONS:
+        return None
+    lhs, _, rhs = constraint_str.partition(matches[0])
+    return lhs.strip(), _RELATIONS[matches[0]], rhs.strip()
+
+
+_ZERO_LITERAL = re.compile(r'^0+(\.0*)?$')
+
+
+def is_nonnegativity_bound(constraint_str: str, var_names) -> bool:
+    """
+    Indica si la restricción es la cota de no negatividad de una variable.
+
+    Sólo "x >= 0" y "0 <= x" cuentan; "x <= 0" es una restricción real del modelo.
+
+    Args:
+        constraint_str: Restricción como string (ej. "x1 >= 0")
+        var_names: Nombres de las variables del modelo
+
+    Returns:
+        True si la restricción es "var >= 0" o "0 <= var"
+    """
+    parts = split_relation(constraint_str)
+    if parts is None:
+        return False
+    lhs, op, rhs = parts
+    if op == "<=":
+        lhs, rhs = rhs, lhs
+    elif op != ">=":
+        return False
+    return lhs in var_names and bool(_ZERO_LITERAL.match(rhs))
+
+
+def sympify_side(side_str: str, symbols: Dict[str, sp.Symbol]) -> sp.Expr:
+    """
+    Convierte un lado de la restricción; los números literales no pasan por el parser de SymPy.
+    
+    Args:
+        side_str: Texto de un lado de la relación (ej. "10" o "3*x2")
+        symbols: Diccionario nombre -> símbolo
+        
+    Returns:
+        Integer/Float para literales numéricos, o la expresión SymPy en otro caso
+    """
+    for cast in (int, float):
+        try:
+            return sp.sympify(cast(side_str))
+        except ValueError:
+            pass
+    return sp.sympify(side_str, locals=symbols)
+
+
+# Producto implícito "2x1": SymEngine lo acepta y SymPy no; se envía a SymPy para que el resultado no
+# dependa del backend (la notación científica "1e5" no cuenta)
+_IMPLICIT_PRODUCT = re.compile(r'(?<![\w.])\d+\.?\d*(?![eE][+-]?\d)[A-Za-z_]')
+
+
+@lru_cache(maxsize=2048)
+def linear_coefficients(expr_str: str, var_names: Tuple[str, ...]) -> Tuple[Tuple[float, ...], float]:
+    """
+    Coeficientes de una expresión lineal ya reducidos a floats, memoizados por (texto, variables).
+    
+    Analizar y luego resolver el mismo modelo expande cada expresión una sola vez.
+    Los coeficientes simbólicos constantes (sqrt(2), pi...) se evalúan numéricamente.
+    
+    Args:
+        expr_str: Expresión como string (ej. "3*x1 + 2*(x2 - 1)")
+        var_names: Nombres de las variables en orden
+        
+    Returns:
+        (coeficiente por variable, término constante)
+        
+    Raises:
+        ValueError: Si la expresión no es lineal en las variables o contiene símbolos desconocidos
+    """
+    if (se is not None and all(_is_symengine_symbol(v) for v in var_names)
+            and not _IMPLICIT_PRODUCT.search(expr_str)):
+        try:
+            # SymEngine (C++) parsea y expande mucho más rápido; SymPy queda como respaldo
+            expr = se.expand(se.sympify(expr_str))
+            return _split_linear(expr, [se.Symbol(v) for v in var_names], expr_str)
+        except ValueError:
+            raise
+        except Exception:
+            pass
+    symbols = {name: get_symbol(name) for name in var_names}
+    expr = sp.expand(sympify_side(expr_str, symbols))
+    return _split_linear(expr, [symbols[v] for v in var_names], expr_str)
+
+
+def _split_linear(expr, symbols, expr_str: str) -> Tuple[Tuple[float, ...], float]:
+    """Separa una expresión expandida (SymPy o SymEngine) en coeficientes y constante numéricos."""
+    coeffs = [expr.coeff(sym) for sym in symbols]
+    const = expr.subs({sym: 0 for sym in symbols})
+    # Lo que no es coeficiente*variable ni constante (x1*x2, sin(x1)...) queda en el residuo
+    residual = expr - const - sum(c * sym for c, sym in zip(coeffs, symbols))
+    if any(term.free_symbols for term in (*coeffs, const)) or residual.expand() != 0:
+        raise ValueError(f"La expresión '{expr_str}' no es lineal en las variables del modelo")
+    return tuple(float(c) for c in coeffs), float(const)
+
+
+@lru_cache(maxsize=2048)
+def linear_constraint(constraint_str: str, var_names: Tuple[str, ...]) -> Optional[Tuple[Tuple[float, ...], str, float]]:
+    """
+    Restricción lineal reducida a (coeficientes, operador, rhs) con las variables a la izquierda.
+    
+    Args:
+        constraint_str: Restricción como string (ej. "x1 + 2 <= 3*x2 + 10")
+        var_names: Nombres de las variables en orden
+        
+    Returns:
+        (coeficientes de lhs - rhs, operador, constante de rhs - lhs); None si no es "lhs OP rhs"
+        
+    Raises:
+        ValueError: Si algún lado no es lineal en las variables
+    """
+    parts = split_relation(constraint_str)
+    if parts is None:
+        return None
+    lhs_str, op, rhs_str = parts
+    lhs_coeffs, lhs_const = linear_coefficients(lhs_str, var_names)
+    rhs_coeffs, rhs_const = linear_coefficients(rhs_str, var_names)
+    return tuple(l - r for l, r in zip(lhs_coeffs, rhs_coeffs)), op, rhs_const - lhs_const
+
+
+@lru_cache(maxsize=1024)
+def _is_symengine_symbol(name: str) -> bool:
+    """True si SymEngine interpreta el nombre como símbolo (no como constante: E, I, pi...)."""
+    try:
+        return se.sympify(name).is_Symbol
+    except Exception:
+        return False
+
 
 def insert_multiplication(expr_str: str) -> str:
     """
@@ -105,8 +283,6 @@ def matrix_to_nested_list(matrix_str: str) -> list:
     Returns:
         Nested list que puede ser convertida a JSON
     """
-    import json
-    
     # Remover "Matrix(" al inicio y ")" al final
     if matrix_str.startswith("Matrix("):
         matrix_str = matrix_str[7:-1]  # Remover "Matrix(" y ")"
@@ -147,7 +323,6 @@ def reorder_expression_terms(expr_str: str, original_vars: list, slack_vars: lis
         return expr_str
     
     # Dividir por + y - manteniendo los operadores
-    import re
     # Patrón para dividir pero mantener operadores
     parts = re.split(r'(?<=[0-9a-zA-Z_\)])\s*([+-])\s*', expr_str)
     
@@ -17,6 +17,7 @@ import numpy as np
 from dataclasses import dataclass
 
 from app.core.logger import logger
+from app.services.expression_utils import is_nonnegativity_bound, linear_coefficients, linear_constraint
 from app.schemas.analyze_schema import MathematicalModel
 
 
@@ -109,17 +110,10 @@ class InteriorPointMethod:
     
     def _parse_problem(self, model: MathematicalModel):
         """Parsea el modelo a matrices para el solver."""
-        import sympy as sp
-        import re
-        
         try:
-            symbols = {name: sp.Symbol(name, real=True, positive=True) 
-                      for name in self.var_names}
-            
             # Función objetivo
-            obj_expr = sp.sympify(model.objective_function, locals=symbols)
-            c = np.array([float(obj_expr.coeff(symbols[v], 1) or 0) 
-                         for v in self.var_names])
+            var_key = tuple(self.var_names)
+            c = np.array(linear_coefficients(model.objective_function, var_key)[0])
             
             # Restricciones
             A_ub_rows = []
@@ -130,38 +124,17 @@ class InteriorPointMethod:
             for constraint_str in (model.constraints or []):
                 constraint_str = constraint_str.strip()
                 
-                # Filtrar no-negatividad
-                is_nonnegativity = False
-                for v in self.var_names:
-                    pattern_ge = rf'^{re.escape(v)}\s*>=\s*0$'
-                    pattern_le = rf'^{re.escape(v)}\s*<=\s*0$'
-                    if re.match(pattern_ge, constraint_str) or re.match(pattern_le, constraint_str):
-                        is_nonnegativity = True
-                        break
-                
-                if is_nonnegativity:
+                # Filtrar cotas de no-negatividad ("xi >= 0"); "xi <= 0" es una restricción real
+                if is_nonnegativity_bound(constraint_str, var_key):
                     continue
                 
-                # Parsear
-                parts = None
-                for op in ["<=", ">=", "="]:
-                    if op in constraint_str:
-                        left, right = constraint_str.split(op, 1)
-                        parts = (left.strip(), op, right.strip())
-                        break
+                # Parsear con todo movido al lado izquierdo (coeficientes memoizados por texto)
+                parsed = linear_constraint(constraint_str, var_key)
                 
-                if not parts:
+                if not parsed:
                     continue
                 
-                lhs_str, op, rhs_str = parts
-                lhs_expr = sp.sympify(lhs_str, locals=symbols)
-                rhs_expr = sp.sympify(rhs_str, locals=symbols)
-                
-                # Combinar
-                combined = lhs_expr - rhs_expr
-                coeffs = [float(combined.coeff(symbols[v], 1) or 0) for v in self.var_names]
-                constant = float(combined.subs({symbols[v]: 0 for v in self.var_names}))
-                rhs_val = -constant
+                coeffs, op, rhs_val = parsed
                 
                 if op == "<=":
                     A_ub_rows.append(coeffs)
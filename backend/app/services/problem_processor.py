@@ -9,7 +9,7 @@ from sympy import Symbol
 from sympy.core.relational import Relational
 
 from app.core.logger import logger
-from app.services.expression_utils import insert_multiplication
+from app.services.expression_utils import insert_multiplication, get_symbol
 
 
 class ProblemProcessor:
@@ -95,7 +95,7 @@ class ProblemProcessor:
                     raise ValueError("'variables' debe ser un diccionario")
 
                 for var_name, description in self.raw_problem["variables"].items():
-                    symbol = sp.Symbol(var_name, real=True, positive=True)
+                    symbol = get_symbol(var_name)
                     self.problem["variables"][symbol] = description or ""
 
                 logger.info(f"Variables procesadas: {list(self.problem['variables'].keys())}")
@@ -130,20 +130,15 @@ class ProblemProcessor:
 
                     lhs, rhs = rel.lhs, rel.rhs
                     
-                    # Mapear operadores desde el tipo de relación
-                    rel_type = type(rel).__name__
-                    if "LessThan" in rel_type and "Not" not in rel_type:
+                    # Mapear operadores desde el tipo de relación (las estrictas se tratan como no estrictas)
+                    if isinstance(rel, (sp.LessThan, sp.StrictLessThan)):
                         op = "<="
-                    elif "StrictLessThan" in rel_type:
-                        op = "<"
-                    elif "GreaterThan" in rel_type and "Not" not in rel_type:
+                    elif isinstance(rel, (sp.GreaterThan, sp.StrictGreaterThan)):
                         op = ">="
-                    elif "StrictGreaterThan" in rel_type:
-                        op = ">"
-                    elif "Equality" in rel_type:
+                    elif isinstance(rel, sp.Equality):
                         op = "="
                     else:
-                        raise ValueError(f"Tipo de relación no reconocido: {rel_type}")
+                        raise ValueError(f"Tipo de relación no reconocido: {type(rel).__name__}")
 
                     # Normalizar según el operador
                     if op == "<=":
@@ -2,7 +2,10 @@
 SolverService: Implementación didáctica del método Simplex con visualización de tablas.
 """
 
-from typing import Dict, List, Optional, Tuple, Any
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple, Any
 import sympy as sp
 import numpy as np
 
@@ -14,40 +17,194 @@ from app.services.dual_simplex_method import DualSimplexMethod
 from app.services.dual_simplex_visualizer import DualSimplexVisualizer
 from app.services.interior_point_method import InteriorPointMethod
 from app.services.sensitivity_analysis import SensitivityAnalyzer
+from app.services.expression_utils import (
+    get_symbol, is_nonnegativity_bound, linear_coefficients, linear_constraint, split_relation, sympify_side
+)
 
 try:
     import pulp
 except Exception:
     pulp = None
 
+try:
+    from scipy.linalg.blas import dger
+except Exception:
+    dger = None
+
+
+def _to_float(expr: Any) -> float:
+    """Convierte expresión SymPy a float de forma segura."""
+    try:
+        if expr is None or expr == 0:
+            return 0.0
+        # Si es un número (Python o átomo numérico SymPy), convertir directamente sin evalf()
+        if isinstance(expr, (int, float, sp.Rational, sp.Float)):
+            return float(expr)
+        # Si es SymPy, evaluar numéricamente
+        if isinstance(expr, sp.Basic):
+            return float(expr.evalf())
+        return float(expr)
+    except Exception as e:
+        logger.warning(f"Error convirtiendo {expr} a float: {e}, retornando 0.0")
+        return 0.0
+
+
+def _pivot(tableau: np.ndarray, leaving_row: int, entering_col: int) -> None:
+    """Pivoteo en el lugar con una actualización de rango 1 (GER)."""
+    tableau[leaving_row] /= tableau[leaving_row, entering_col]
+    # Se anula la entrada de la fila pivote para que ésta no se reste a sí misma
+    col = tableau[:, entering_col].copy()
+    col[leaving_row] = 0.0
+    if dger is not None and tableau.flags.f_contiguous and tableau.dtype == np.float64:
+        # BLAS dger escribe directamente sobre el tableau (orden Fortran), sin la matriz temporal de np.outer
+        dger(-1.0, col, tableau[leaving_row], a=tableau, overwrite_a=True)
+    else:
+        tableau -= np.outer(col, tableau[leaving_row])
+
+
+# Sentido de cada restricción para la máscara de factibilidad del método gráfico
+_SENSE_CODE = {"<=": 0, ">=": 1}
+
+
+def _feasible_mask(verts: np.ndarray, A: np.ndarray, b: np.ndarray, sense: np.ndarray, tol: float,
+                   neg_tol: float) -> np.ndarray:
+    """Máscara de vértices factibles: LHS (vértices x restricciones) en un solo producto."""
+    residual = verts @ A.T - b
+    ok = np.where(sense == 0, residual <= tol, np.where(sense == 1, residual >= -tol, np.abs(residual) <= tol))
+    return ok.all(axis=1) & np.all(verts >= -neg_tol, axis=1)
+
+
+@lru_cache(maxsize=256)
+def _get_symbols(var_names: Tuple[str, ...]) -> Dict[str, sp.Symbol]:
+    """Símbolos SymPy de las variables, compartidos entre llamadas (no mutar el dict)."""
+    return {name: get_symbol(name) for name in var_names}
+
+
+@lru_cache(maxsize=256)
+def _lambdify_objective(objective_function: str, var_names: Tuple[str, ...]) -> Any:
+    """Función objetivo compilada a NumPy (una vez por texto y variables) para evaluar en lote."""
+    symbols = _get_symbols(var_names)
+    obj_expr = sp.sympify(objective_function, locals=symbols)
+    return sp.lambdify([symbols[v] for v in var_names], obj_expr, modules='numpy')
+
+
+@lru_cache(maxsize=2048)
+def _sympify_relation(constraint_str: str, var_names: Tuple[str, ...]) -> Optional[sp.Basic]:
+    """Relación SymPy de una restricción, memoizada por (texto, variables). None si no es relación.
+    
+    El texto se separa por el operador antes de SymPy: sólo se parsea cada lado, y un RHS
+    numérico se convierte directamente.
+    """
+    parts = split_relation(constraint_str)
+    if parts is None:
+        return None
+    symbols = _get_symbols(var_names)
+    lhs_str, op, rhs_str = parts
+    try:
+        return sp.Rel(sympify_side(lhs_str, symbols), sympify_side(rhs_str, symbols),
+                      "==" if op == "=" else op, evaluate=False)
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=1024)
+def _parse_constraint_cached(constraint_str: str, var_names: Tuple[str, ...]) -> Optional[Tuple[Any, str, Any]]:
+    """(lhs expandido, operador, rhs) simbólicos de una restricción, memoizados. None si falla."""
+    rel = _sympify_relation(constraint_str, var_names)
+    if rel is None:
+        return None
+    return (sp.expand(rel.lhs), SolverService._extract_relation_type(rel), rel.rhs)
+
+
+# Signo que lleva cada fila a la forma "<=" (las igualdades se conservan)
+_ROW_SIGN = {"<=": 1.0, ">=": -1.0, "=": 1.0}
+
+
+@lru_cache(maxsize=1024)
+def _is_linear(expr_str: str, var_names: Tuple[str, ...]) -> bool:
+    """Verifica linealidad con el mismo parser que usan los solvers (memoizado y compartido con ellos).
+    
+    Ningún escaneo de texto decide solo: "x1*2*x2" o "(x1+1)*(x2+1)" parecen lineales y
+    "sqrt(2)*x1" o "pi*x1" parecen no lineales.
+    """
+    try:
+        if split_relation(expr_str) is not None:
+            linear_constraint(expr_str, var_names)
+        else:
+            linear_coefficients(expr_str, var_names)
+    except sp.SympifyError:
+        # Si no se puede interpretar, la validación de linealidad no bloquea (el solver reportará el error)
+        return True
+    except ValueError:
+        return False
+    except Exception:
+        return True
+    return True
+
+
+@dataclass(frozen=True)
+class _ModelContext:
+    """Datos derivados del texto de un modelo, compartidos entre el análisis y la resolución."""
+    structural: Tuple[str, ...]  # restricciones sin las de no negatividad
+    senses: Tuple[Optional[str], ...]  # operador de cada restricción estructural ("<=", ">=", "=")
+    is_linear: bool
+
+
+@lru_cache(maxsize=256)
+def _model_context(objective_function: str, constraints: Tuple[str, ...],
+                   var_names: Tuple[str, ...]) -> _ModelContext:
+    """Contexto memoizado por texto: analizar y luego resolver el mismo modelo lo calcula una vez."""
+    structural = tuple(c for c in constraints if not is_nonnegativity_bound(c, var_names))
+    return _ModelContext(
+        structural=structural,
+        senses=tuple((split_relation(c) or (None, None, None))[1] for c in structural),
+        is_linear=all(_is_linear(expr, var_names) for expr in (objective_function, *constraints))
+    )
+
 
 class SolverService:
     """Servicio para resolver problemas de optimización lineal con Simplex didáctico."""
 
     _TOL = 1e-10
     _FEASIBLE_TOL = 1e-6
+    # Problemas grandes (o grandes y dispersos) se delegan a HiGHS: el tableau es sólo didáctico
+    _DIDACTIC_MAX = 30
+    _SPARSE_DENSITY = 0.25
+    _SPARSE_MIN_SIZE = 500
+    # Simplex revisado sobre csc_matrix + splu: opcional con model.metadata["sparse_revised"]
+    _REVISED_DENSITY = 0.3
+    _REVISED_MIN_DIM = 64
+    # Método -> implementación; sólo los métodos basados en una base óptima tienen análisis de sensibilidad
+    # (punto interior termina cerca del centro de la cara óptima, no en un vértice)
+    _METHODS = {
+        "big_m": "_solve_big_m",
+        "dual_simplex": "_solve_dual_simplex",
+        "interior_point": "_solve_interior_point",
+        "simplex": "_simplex_tableau",
+        "graphical": "_graphical_method",
+    }
+    SUPPORTED_METHODS = tuple(_METHODS)
+    _SENSITIVITY_METHODS = frozenset({"simplex", "dual_simplex", "big_m"})
+    # Únicos métodos admitidos en minimización (tupla para los mensajes, frozenset para la comprobación)
+    MIN_METHODS = ("dual_simplex", "big_m", "interior_point")
+    _MIN_ALLOWED = frozenset(MIN_METHODS)
 
-    def __init__(self):
-        pass
+    def __init__(self, context: Optional[Tuple[Tuple, _ModelContext]] = None):
+        # Contexto ya calculado por quien crea el servicio (ej. el proceso web antes de pasar al pool):
+        # los workers no comparten la caché de _model_context con ese proceso
+        self._preset_context = context
 
     def _safe_float_conversion(self, expr: Any) -> float:
         """Convierte expresión SymPy a float de forma segura."""
-        try:
-            if expr is None or expr == 0:
-                return 0.0
-            # Si es un número, convertir directamente
-            if isinstance(expr, (int, float)):
-                return float(expr)
-            # Si es SymPy, evaluar numéricamente
-            if isinstance(expr, sp.Basic):
-                return float(expr.evalf())
-            return float(expr)
-        except Exception as e:
-            logger.warning(f"Error convirtiendo {expr} a float: {e}, retornando 0.0")
-            return 0.0
+        return _to_float(expr)
 
     def determine_applicable_methods(self, model: MathematicalModel) -> Tuple[List[str], Dict[str, str]]:
         """Retorna métodos sugeridos y no aplicables."""
+        # Un modelo no lineal no admite ninguno de los métodos de programación lineal
+        if not self._context(model).is_linear:
+            reason = "El modelo no es lineal"
+            return [], {method: reason for method in ["simplex", "graphical", "big_m", "dual_simplex", "interior_point"]}
+        
         # Detectar si el problema necesita el método de la Gran M
         needs_big_m = self._needs_big_m(model)
         
@@ -93,19 +250,7 @@ class SolverService:
 
     def _needs_big_m(self, model: MathematicalModel) -> bool:
         """Verifica si el problema tiene restricciones >= o = que requieren Gran M."""
-        if not model.constraints:
-            return False
-        
-        for constraint in model.constraints:
-            # Filtrar restricciones de no-negatividad
-            if any(f"{v} >= 0" in constraint or f"{v} <= 0" in constraint 
-                   for v in model.variables.keys()):
-                continue
-            
-            if ">=" in constraint or "=" in constraint:
-                return True
-        
-        return False
+        return any(op in (">=", "=") for op in self._context(model).senses)
     
     def _is_dual_simplex_candidate(self, model: MathematicalModel) -> bool:
         """
@@ -113,57 +258,34 @@ class SolverService:
         
         Criterios:
         - Debe ser un problema de minimización
-        - Debe tener restricciones >= (preferentemente)
+        - Debe tener al menos una restricción >=
         """
-        if model.objective != "min":
-            return False
-        
-        if not model.constraints:
-            return False
-        
-        # Contar restricciones >=
-        ge_count = 0
-        for constraint in model.constraints:
-            # Filtrar restricciones de no-negatividad
-            if any(f"{v} >= 0" in constraint or f"{v} <= 0" in constraint 
-                   for v in model.variables.keys()):
-                continue
-            
-            if ">=" in constraint:
-                ge_count += 1
-        
-        # Es candidato si tiene al menos una restricción >=
-        return ge_count > 0
+        return model.objective == "min" and ">=" in self._context(model).senses
 
     def solve(self, model: MathematicalModel, method: str = "simplex") -> Dict[str, Any]:
         """Resuelve usando Simplex tableau, Gran M, Simplex Dual, Punto Interior o método gráfico según el método."""
         try:
             # Validación: problemas de minimización solo pueden usar dual_simplex, big_m o interior_point
             if model.objective == "min":
-                if method not in ["dual_simplex", "big_m", "interior_point"]:
+                if method not in self._MIN_ALLOWED:
                     return {
                         "success": False,
                         "error": f"Los problemas de minimización solo pueden resolverse con el Método Simplex Dual, el Método de la Gran M o el Método de Punto Interior. El método '{method}' no está disponible para minimización.",
-                        "allowed_methods": ["dual_simplex", "big_m", "interior_point"],
+                        "allowed_methods": list(self.MIN_METHODS),
                         "objective_type": "min"
                     }
             
             # Resolver según el método
-            if method == "big_m":
-                result = self._solve_big_m(model)
-            elif method == "dual_simplex":
-                result = self._solve_dual_simplex(model)
-            elif method == "interior_point":
-                result = self._solve_interior_point(model)
-            elif method == "simplex":
-                result = self._simplex_tableau(model)
-            elif method == "graphical":
-                result = self._graphical_method(model)
-            else:
+            impl = self._METHODS.get(method)
+            if impl is None:
                 return {"success": False, "error": f"Método no soportado: {method}"}
+            # Mismo criterio que determine_applicable_methods: ningún método lineal resuelve un modelo no lineal
+            if not self._context(model).is_linear:
+                return {"success": False, "error": "El modelo no es lineal"}
+            result = getattr(self, impl)(model)
             
             # Añadir análisis de sensibilidad para métodos compatibles
-            if result.get("success") and method in ["simplex", "dual_simplex", "big_m"]:
+            if result.get("success") and method in self._SENSITIVITY_METHODS:
                 sensitivity_result = self._perform_sensitivity_analysis(model, result, method)
                 if sensitivity_result.get("success"):
                     result["sensitivity_analysis"] = sensitivity_result.get("sensitivity_analysis")
@@ -187,14 +309,13 @@ class SolverService:
         """
         try:
             var_names = list(model.variables.keys())
-            symbols = {name: sp.Symbol(name, real=True, positive=True) for name in var_names}
+            symbols = _get_symbols(tuple(var_names))
             
             # Parsear función objetivo para obtener coeficientes c
-            obj_expr = sp.sympify(model.objective_function, locals=symbols)
-            c = np.array([self._safe_float_conversion(obj_expr.coeff(symbols[v], 1) or 0) for v in var_names])
+            c = np.array(linear_coefficients(model.objective_function, tuple(var_names))[0])
             
             # Parsear restricciones para obtener RHS (b)
-            structural_constraints = self._filter_nonneg_constraints(model.constraints or [], var_names)
+            structural_constraints = list(self._context(model).structural)
             b = []
             constraint_names = []
             
@@ -302,145 +423,190 @@ class SolverService:
         return interpretation
 
     def _convert_numpy_types(self, obj: Any) -> Any:
-        """Convierte tipos NumPy a tipos nativas de Python para JSON serialización."""
-        if isinstance(obj, (np.integer, np.floating)):
-            return float(obj) if isinstance(obj, np.floating) else int(obj)
-        elif isinstance(obj, np.ndarray):
-            return obj.tolist()
-        elif isinstance(obj, dict):
-            return {k: self._convert_numpy_types(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._convert_numpy_types(item) for item in obj]
-        return obj
-
-    def _extract_relation_type(self, rel: Any) -> str:
+        """Convierte tipos NumPy a tipos nativos de Python para JSON serialización.
+        
+        Recorre dicts/listas/tuplas con una pila explícita (sin recursión) y convierte
+        cada ndarray en bloque con tolist(); un mismo arreglo referenciado varias veces
+        se convierte una sola vez.
+        """
+        converted = {}
+        
+        def convert_leaf(value: Any) -> Any:
+            if isinstance(value, np.ndarray):
+                if id(value) not in converted:
+                    converted[id(value)] = value.tolist()
+                return converted[id(value)]
+            if isinstance(value, np.floating):
+                return float(value)
+            if isinstance(value, np.integer):
+                return int(value)
+            return value
+        
+        def new_container(value: Any) -> Any:
+            return {} if isinstance(value, dict) else [None] * len(value)
+        
+        if not isinstance(obj, (dict, list, tuple)):
+            return convert_leaf(obj)
+        
+        root = new_container(obj)
+        pending = deque([(obj, root)])
+        while pending:
+            source, target = pending.pop()
+            for key, value in (source.items() if isinstance(source, dict) else enumerate(source)):
+                if isinstance(value, (dict, list, tuple)):
+                    target[key] = new_container(value)
+                    pending.append((value, target[key]))
+                else:
+                    target[key] = convert_leaf(value)
+        return root
+
+    @staticmethod
+    def _extract_relation_type(rel: Any) -> str:
         """Extrae el operador de una relación SymPy."""
-        rel_type = str(type(rel).__name__)
-        if "LessThan" in rel_type:
-            return "<="
-        elif "GreaterThan" in rel_type:
+        if isinstance(rel, (sp.GreaterThan, sp.StrictGreaterThan)):
             return ">="
-        elif "Equality" in rel_type:
+        if isinstance(rel, sp.Equality):
             return "="
         return "<="
 
     def _parse_constraint(self, constraint_str: str, symbols: Dict[str, Any]) -> Optional[Tuple[Any, str, Any]]:
         """Parsea una restricción string a (lhs, op, rhs). Retorna None si falla."""
         try:
-            rel = sp.sympify(constraint_str, locals=symbols, evaluate=False)
-            if hasattr(rel, 'lhs') and hasattr(rel, 'rhs'):
-                return (sp.expand(rel.lhs), self._extract_relation_type(rel), rel.rhs)
-        except:
-            pass
-        return None
+            return _parse_constraint_cached(constraint_str, tuple(symbols))
+        except Exception:
+            return None
+
+    @staticmethod
+    def _context_key(model: MathematicalModel) -> Tuple:
+        """Clave de texto con la que se memoiza el contexto del modelo."""
+        return model.objective_function, tuple(model.constraints or []), tuple(model.variables.keys())
 
-    def _filter_nonneg_constraints(self, constraints: List[str], var_names: List[str]) -> List[str]:
-        """Filtra restricciones de no-negatividad."""
-        return [c for c in constraints if not any(f"{v} >= 0" in c or f"{v}<= 0" in c for v in var_names)]
+    @classmethod
+    def model_context(cls, model: MathematicalModel) -> Tuple[Tuple, _ModelContext]:
+        """(clave, contexto) memoizado del modelo, serializable para entregarlo a otro proceso."""
+        key = cls._context_key(model)
+        return key, _model_context(*key)
+
+    def _context(self, model: MathematicalModel) -> _ModelContext:
+        """Contexto compartido (restricciones estructurales, linealidad) del modelo."""
+        key = self._context_key(model)
+        if self._preset_context is not None and self._preset_context[0] == key:
+            return self._preset_context[1]
+        return _model_context(*key)
 
     def _generate_equations_latex(self, structural_constraints: List[str], var_names: List[str], 
                                   symbols: Dict[str, Any], A: np.ndarray, b: np.ndarray) -> str:
-        """Genera ecuaciones LaTeX con variables de holgura para cada restricción."""
-        equations = []
-        for i in range(len(b)):
-            var_terms = []
-            for j, var in enumerate(var_names):
-                coeff = float(A[i, j])
-                if abs(coeff) > self._TOL:
-                    coeff_str = f"{int(coeff)}" if coeff == int(coeff) else f"{coeff:.4g}"
-                    base_name = var.rstrip('0123456789')
-                    var_idx = j + 1
-                    var_sub = f"{base_name}_{{{var_idx}}}"
-                    if coeff == 1:
-                        var_terms.append(f"{var_sub}")
-                    elif coeff == -1:
-                        var_terms.append(f"-{var_sub}")
-                    elif coeff > 0:
-                        var_terms.append(f"{coeff_str}{var_sub}")
-                    else:
-                        var_terms.append(f"{coeff_str}{var_sub}")
-            
-            eq = var_terms[0] if var_terms else "0"
-            for term in var_terms[1:]:
-                eq += f" + {term}" if not term.startswith("-") else f" {term}"
-            
-            slack_name = f"s_{{{i+1}}}"
-            rhs = float(b[i])
-            
-            latex_eq = f"{eq} + {slack_name} = {int(rhs) if rhs == int(rhs) else f'{rhs:.4g}'}"
-            equations.append(f"\\[{latex_eq}\\]")
+        """Genera ecuaciones LaTeX con variables de holgura para cada restricción (Simplex y método gráfico)."""
+        def fmt(value: float) -> str:
+            return f"{int(value)}" if value == int(value) else f"{value:.4g}"
+        
+        # Subíndices y máscara de coeficientes no nulos calculados una sola vez
+        var_subs = [f"{var.rstrip('0123456789')}_{{{j + 1}}}" for j, var in enumerate(var_names)]
+        nz_mask = np.abs(A) > self._TOL
         
-        return "\n".join(equations)
-
-    def _generate_equations_latex_graphical(self, structural_constraints: List[str], var_names: List[str],
-                                           symbols: Dict[str, Any], A: np.ndarray, b: np.ndarray) -> str:
-        """Genera ecuaciones LaTeX con variables de holgura para método gráfico."""
         equations = []
         for i in range(len(b)):
             var_terms = []
-            for j, var in enumerate(var_names):
+            for j in np.flatnonzero(nz_mask[i]):
                 coeff = float(A[i, j])
-                if abs(coeff) > self._TOL:
-                    coeff_str = f"{int(coeff)}" if coeff == int(coeff) else f"{coeff:.4g}"
-                    base_name = var.rstrip('0123456789')
-                    var_idx = j + 1
-                    var_sub = f"{base_name}_{{{var_idx}}}"
-                    if coeff == 1:
-                        var_terms.append(f"{var_sub}")
-                    elif coeff == -1:
-                        var_terms.append(f"-{var_sub}")
-                    elif coeff > 0:
-                        var_terms.append(f"{coeff_str}{var_sub}")
-                    else:
-                        var_terms.append(f"{coeff_str}{var_sub}")
+                prefix = "" if coeff == 1 else "-" if coeff == -1 else fmt(coeff)
+                var_terms.append(f"{prefix}{var_subs[j]}")
             
             eq = var_terms[0] if var_terms else "0"
-            for term in var_terms[1:]:
-                eq += f" + {term}" if not term.startswith("-") else f" {term}"
-            
-            slack_name = f"s_{{{i+1}}}"
-            rhs = float(b[i])
+            eq += "".join(f" {term}" if term.startswith("-") else f" + {term}" for term in var_terms[1:])
             
-            latex_eq = f"{eq} + {slack_name} = {int(rhs) if rhs == int(rhs) else f'{rhs:.4g}'}"
+            latex_eq = f"{eq} + s_{{{i+1}}} = {fmt(float(b[i]))}"
             equations.append(f"\\[{latex_eq}\\]")
         
         return "\n".join(equations)
 
     def _simplex_tableau(self, model: MathematicalModel) -> Dict[str, Any]:
         """Método Simplex Tableau con tablas en cada iteración."""
+        steps = []
+        for kind, payload in self._simplex_tableau_stream(model):
+            if kind == "iter":
+                steps.append(payload)
+            elif kind == "final":
+                result = dict(payload)
+                result.setdefault("steps", steps)
+                return self._convert_numpy_types(result)
+        return {"success": False, "error": "El método Simplex no produjo resultado", "steps": []}
+
+    def solve_simplex_stream(self, model: MathematicalModel) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Emite las tablas del Simplex a medida que se calculan.
+        
+        Produce ("init", datos iniciales), un ("iter", paso) por pivote y ("final", resultado sin pasos).
+        Los arreglos NumPy se entregan tal cual: app.utils.json_utils.dumps los convierte al serializar.
+        """
+        return self._simplex_tableau_stream(model)
+
+    def _simplex_tableau_stream(self, model: MathematicalModel) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Generador del Simplex Tableau: cada iteración se entrega en cuanto se calcula."""
         try:
             var_names = list(model.variables.keys())
+            var_key = tuple(var_names)
             n = len(var_names)
-            symbols = {name: sp.Symbol(name, real=True, positive=True) for name in var_names}
+            symbols = _get_symbols(var_key)
             
-            # Parsear función objetivo
-            obj_expr = sp.sympify(model.objective_function, locals=symbols)
-            c = np.array([self._safe_float_conversion(obj_expr.coeff(symbols[v], 1) or 0) for v in var_names])
+            # Función objetivo: coeficientes memoizados por texto y variables
+            c = np.array(linear_coefficients(model.objective_function, tuple(var_names))[0])
             is_max = model.objective == "max"
             if not is_max:
                 c = -c
             
             # Parsear restricciones
-            structural_constraints = self._filter_nonneg_constraints(model.constraints or [], var_names)
-            A, b = [], []
+            structural_constraints = list(self._context(model).structural)
+            A = np.zeros((len(structural_constraints), n))
+            b = np.zeros(len(structural_constraints))
+            is_eq = np.zeros(len(structural_constraints), dtype=bool)
+            m = 0
             
             for constraint_str in structural_constraints:
-                parsed = self._parse_constraint(constraint_str, symbols)
+                parsed = linear_constraint(constraint_str, var_key)
                 if not parsed:
                     continue
-                lhs, op, rhs_val = parsed
-                row = np.array([self._safe_float_conversion(lhs.coeff(symbols[v], 1) or 0) for v in var_names])
-                if '>=' in op:
-                    row, rhs_val = -row, -self._safe_float_conversion(rhs_val)
-                A.append(row)
-                b.append(self._safe_float_conversion(rhs_val))
-            
-            if not A:
-                return {"success": False, "error": "No hay restricciones estructurales", "steps": []}
-            
-            A, b, m = np.array(A), np.array(b), len(b)
-            tableau = np.hstack([A, np.eye(m), b.reshape(-1, 1)])
-            obj_row = np.hstack([[-ci for ci in c], np.zeros(m), [0]])
+                coeffs, op, rhs_val = parsed
+                sign = _ROW_SIGN[op]
+                A[m] = coeffs
+                A[m] *= sign
+                b[m] = sign * rhs_val
+                is_eq[m] = op == '='
+                m += 1
+            
+            if not m:
+                yield "final", {"success": False, "error": "No hay restricciones estructurales", "steps": []}
+                return
+            
+            A, b, is_eq = A[:m], b[:m], is_eq[:m]
+            
+            density = np.count_nonzero(A) / A.size
+            # La base inicial de holguras exige sólo filas "<=" con b >= 0
+            if (model.metadata.get("sparse_revised", False) and density < self._REVISED_DENSITY
+                    and m + n > self._REVISED_MIN_DIM and not is_eq.any() and np.all(b >= 0)):
+                yield "final", self._solve_sparse_revised(c, A, b, var_names, is_max, structural_constraints, symbols)
+                return
+            
+            too_large = m + n > self._DIDACTIC_MAX or (A.size > self._SPARSE_MIN_SIZE and density < self._SPARSE_DENSITY)
+            if too_large and not model.metadata.get("force_didactic", False):
+                result = self._solve_sparse_highs(c, A, b, var_names, is_max, structural_constraints, symbols, is_eq)
+                # Se avisa que no hay tablas: el cliente puede pedirlas con metadata["force_didactic"]
+                result["steps_omitted"] = True
+                result["steps_note"] = (
+                    f"Problema grande ({m} restricciones, {n} variables): se resolvió sin tablas intermedias. "
+                    "Use metadata {'force_didactic': true} para obtener el tableau paso a paso."
+                )
+                yield "final", result
+                return
+            
+            # La fila Z se apila como última fila: la misma actualización de rango 1
+            # elimina la columna pivote en las restricciones y en la función objetivo.
+            # Orden Fortran: la columna pivote y el RHS que lee el test de razón quedan
+            # contiguos en memoria. Se llena por bloques sin temporales de hstack/vstack.
+            tableau = np.zeros((m + 1, n + m + 1), dtype=np.float64, order='F')
+            tableau[:m, :n] = A
+            tableau[np.arange(m), n + np.arange(m)] = 1.0
+            tableau[:m, -1] = b
+            tableau[m, :n] = -c
             basis = [f"s{i+1}" for i in range(m)]
             basis_cols = list(range(n, n + m))
             slack_names = [f"s{i+1}" for i in range(m)]
@@ -448,41 +614,76 @@ class SolverService:
             # Generar encabezados de columna y etiquetas de fila para visualización
             column_headers = var_names + slack_names + ["RHS"]
             
-            steps = []
-            for _ in range(100):
-                entering_col = np.argmin(obj_row[:-1])
-                if obj_row[entering_col] >= -self._TOL:
+            # Una sola copia del tableau por iteración: la instantánea "después" de un paso
+            # es la misma instancia que la "antes" del siguiente
+            snapshot = tableau.copy()
+            yield "init", {
+                "method": "simplex",
+                "var_names": var_names,
+                "slack_names": slack_names,
+                "column_headers": column_headers,
+                "basis": basis[:],
+                "tableau": snapshot
+            }
+            
+            # Buffer del test de razón reutilizado en todas las iteraciones
+            ratios = np.empty(m, dtype=np.float64)
+            iterations = 0
+            # Regla de Dantzig por defecto; tras el primer pivote degenerado o al repetirse
+            # una base se pasa a la regla de Bland (menor índice), que garantiza
+            # terminación finita sin ciclos. El tope de iteraciones escala con el tamaño.
+            bland = False
+            seen_bases = {tuple(basis_cols)}
+            for _ in range(50 * (m + n)):
+                obj_row = tableau[-1]
+                candidates = np.flatnonzero(obj_row[:-1] < -self._TOL)
+                if candidates.size == 0:
                     break
+                if bland:
+                    entering_col = int(candidates[0])
+                else:
+                    entering_col = int(candidates[np.argmin(obj_row[candidates])])
                 
-                ratios = [tableau[i, -1] / tableau[i, entering_col] if tableau[i, entering_col] > self._TOL else float('inf') 
-                          for i in range(m)]
-                leaving_row = np.argmin(ratios)
+                pivot_col = tableau[:m, entering_col]
+                ratios.fill(np.inf)
+                np.divide(tableau[:m, -1], pivot_col, out=ratios, where=pivot_col > self._TOL)
+                leaving_row = int(ratios.argmin())
                 
-                if ratios[leaving_row] == float('inf'):
-                    return {"success": False, "error": "Problema ilimitado", "steps": []}
+                if not np.isfinite(ratios[leaving_row]):
+                    yield "final", {"success": False, "error": "Problema ilimitado", "steps": []}
+                    return
                 
-                tableau_before, obj_row_before, basis_before = tableau.copy(), obj_row.copy(), basis[:]
+                if bland:
+                    # Empates en la razón mínima: sale la variable básica de menor índice
+                    ties = np.flatnonzero(ratios <= ratios[leaving_row] + self._TOL)
+                    leaving_row = int(min(ties, key=lambda i: basis_cols[i]))
+                elif abs(ratios[leaving_row]) <= self._TOL:
+                    bland = True
+                
+                tableau_before, basis_before = snapshot, basis[:]
                 pivot = tableau[leaving_row, entering_col]
-                tableau[leaving_row] /= pivot
-                for i in range(m):
-                    if i != leaving_row:
-                        tableau[i] -= tableau[i, entering_col] * tableau[leaving_row]
-                obj_row = obj_row - obj_row[entering_col] * np.hstack([tableau[leaving_row]])
+                _pivot(tableau, leaving_row, entering_col)
                 
                 entering_name = var_names[entering_col] if entering_col < n else f"s{entering_col - n + 1}"
                 leaving_name = basis[leaving_row]
                 basis[leaving_row], basis_cols[leaving_row] = entering_name, entering_col
                 
+                basis_key = tuple(basis_cols)
+                if basis_key in seen_bases:
+                    bland = True
+                seen_bases.add(basis_key)
+                
+                # Las instantáneas se guardan como ndarray; _convert_numpy_types convierte
+                # cada instancia compartida una sola vez al serializar
+                snapshot = tableau_after = tableau.copy()
+                
                 # Generar etiquetas de fila (base actual + fila Z)
                 row_labels_before = basis_before + ["Z"]
                 row_labels_after = basis[:] + ["Z"]
                 
-                # Combinar tableau con fila objetivo para visualización completa
-                full_tableau_before = np.vstack([tableau_before, obj_row_before]).tolist()
-                full_tableau_after = np.vstack([tableau.copy(), obj_row.copy()]).tolist()
-                
-                steps.append({
-                    "iteration": len(steps) + 1,
+                iterations += 1
+                yield "iter", {
+                    "iteration": iterations,
                     "type": "iteration",
                     "description": f"Entra {entering_name}, Sale {leaving_name}",
                     "entering_variable": entering_name,
@@ -492,41 +693,195 @@ class SolverService:
                     "entering_col": int(entering_col),
                     "pivot_column": int(entering_col),
                     "pivot_element": float(pivot),
-                    "tableau_before": full_tableau_before,
-                    "obj_row_before": obj_row_before.tolist(),
+                    "tableau_before": tableau_before,
+                    "obj_row_before": tableau_before[-1],
                     "basis_before": basis_before,
-                    "tableau_after": full_tableau_after,
-                    "obj_row_after": obj_row.copy().tolist(),
+                    "tableau_after": tableau_after,
+                    "obj_row_after": tableau_after[-1],
                     "basis_after": basis[:],
                     "var_names": var_names,
                     "slack_names": slack_names,
                     "column_headers": column_headers,
                     "row_labels": row_labels_after,
                     "row_labels_before": row_labels_before
-                })
+                }
+            else:
+                yield "final", {
+                    "success": False,
+                    "error": "Se alcanzó el máximo de iteraciones sin llegar a la solución óptima"
+                }
+                return
             
-            solution = {v: self._safe_float_conversion(tableau[[i for i, bv in enumerate(basis) if bv == v][0], -1]) if v in basis else 0.0 
-                       for v in var_names}
-            obj_value = self._safe_float_conversion(obj_row[-1]) if is_max else -self._safe_float_conversion(obj_row[-1])
+            basis_index = {bv: i for i, bv in enumerate(basis)}
+            solution = {v: float(tableau[basis_index[v], -1]) if v in basis_index else 0.0 for v in var_names}
+            # Valor óptimo como c_B · x_B (las holguras tienen costo cero)
+            c_basis = np.concatenate([c, np.zeros(m)])[basis_cols]
+            z_value = float(c_basis @ tableau[:m, -1])
+            obj_value = z_value if is_max else -z_value
             
             # Generar ecuaciones LaTeX con variables de holgura
             equations_latex = self._generate_equations_latex(structural_constraints, var_names, symbols, A, b)
             
-            return self._convert_numpy_types({
+            yield "final", {
                 "success": True,
                 "method": "simplex",
                 "status": "optimal",
                 "objective_value": obj_value,
                 "variables": solution,
-                "iterations": len(steps),
+                "iterations": iterations,
                 "equations_latex": equations_latex,
-                "steps": steps,
-                "explanation": f"Método Simplex: {len(steps)} iteraciones hasta optimalidad"
-            })
+                "explanation": f"Método Simplex: {iterations} iteraciones hasta optimalidad"
+            }
             
         except Exception as e:
             logger.error(f"Error en _simplex_tableau: {str(e)}", exc_info=True)
-            return {"success": False, "error": str(e), "steps": []}
+            yield "final", {"success": False, "error": str(e), "steps": []}
+
+    @staticmethod
+    def _constraint_matrices(A: np.ndarray, b: np.ndarray, is_eq: np.ndarray) -> Dict[str, Any]:
+        """Separa las filas en bloques CSR A_ub/A_eq listos para linprog (None si un bloque está vacío)."""
+        from scipy import sparse
+        
+        matrices = {"A_ub": None, "b_ub": None, "A_eq": None, "b_eq": None}
+        if (~is_eq).any():
+            matrices["A_ub"], matrices["b_ub"] = sparse.csr_matrix(A[~is_eq]), b[~is_eq]
+        if is_eq.any():
+            matrices["A_eq"], matrices["b_eq"] = sparse.csr_matrix(A[is_eq]), b[is_eq]
+        return matrices
+
+    def _solve_sparse_highs(self, c: np.ndarray, A: np.ndarray, b: np.ndarray, var_names: List[str],
+                            is_max: bool, structural_constraints: List[str],
+                            symbols: Dict[str, Any], is_eq: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        """Resuelve problemas grandes con HiGHS (simplex dual, A dispersa) sin tablas intermedias.
+        
+        Las filas se entregan como matrices CSR (desigualdades en A_ub, igualdades en A_eq)
+        sin construir expresiones intermedias; si SciPy no está disponible se recurre a PuLP.
+        """
+        if is_eq is None:
+            is_eq = np.zeros(A.shape[0], dtype=bool)
+        try:
+            from scipy.optimize import linprog
+        except ImportError:
+            if pulp is None:
+                raise
+            return self._solve_pulp(c, A, b, var_names, is_max, structural_constraints, symbols, is_eq)
+        
+        # c ya está en forma de maximización; linprog minimiza
+        res = linprog(-c, **self._constraint_matrices(A, b, is_eq),
+                      bounds=[(0, None)] * len(var_names), method='highs-ds')
+        
+        if res.status == 3:
+            return {"success": False, "error": "Problema ilimitado", "steps": []}
+        if not res.success:
+            return {"success": False, "error": f"No se encontró solución óptima: {res.message}", "steps": []}
+        
+        obj_value = -float(res.fun) if is_max else float(res.fun)
+        return self._convert_numpy_types({
+            "success": True,
+            "method": "simplex",
+            "status": "optimal",
+            "solver": "highs-ds",
+            "objective_value": obj_value,
+            "variables": {v: float(res.x[j]) for j, v in enumerate(var_names)},
+            "iterations": int(res.nit),
+            "equations_latex": self._generate_equations_latex(structural_constraints, var_names, symbols, A, b),
+            "steps": [],
+            "explanation": f"Método Simplex (HiGHS): {int(res.nit)} iteraciones hasta optimalidad"
+        })
+
+    def _solve_pulp(self, c: np.ndarray, A: np.ndarray, b: np.ndarray, var_names: List[str],
+                    is_max: bool, structural_constraints: List[str],
+                    symbols: Dict[str, Any], is_eq: np.ndarray) -> Dict[str, Any]:
+        """Respaldo con PuLP (CBC) cuando SciPy no está disponible.
+        
+        Las expresiones se construyen con LpAffineExpression a partir de generadores de
+        pares (variable, coeficiente) no nulos: lpSum y el operador <= copian la expresión
+        completa en cada suma, lo que domina el armado en modelos grandes.
+        """
+        pv = [pulp.LpVariable(v, lowBound=0) for v in var_names]
+        prob = pulp.LpProblem("simplex", pulp.LpMaximize)
+        # c ya está en forma de maximización
+        prob += pulp.LpAffineExpression((pv[j], float(c[j])) for j in np.flatnonzero(c))
+        for i in range(A.shape[0]):
+            row = A[i]
+            prob += pulp.LpConstraint(
+                e=pulp.LpAffineExpression((pv[j], float(row[j])) for j in np.flatnonzero(row)),
+                sense=pulp.LpConstraintEQ if is_eq[i] else pulp.LpConstraintLE, rhs=float(b[i]), name=f"R{i + 1}"
+            )
+        
+        prob.solve(pulp.PULP_CBC_CMD(msg=False))
+        status = pulp.LpStatus[prob.status]
+        if status == "Unbounded":
+            return {"success": False, "error": "Problema ilimitado", "steps": []}
+        if status != "Optimal":
+            return {"success": False, "error": f"No se encontró solución óptima: {status}", "steps": []}
+        
+        z_value = float(pulp.value(prob.objective) or 0.0)
+        return self._convert_numpy_types({
+            "success": True,
+            "method": "simplex",
+            "status": "optimal",
+            "solver": "pulp-cbc",
+            "objective_value": z_value if is_max else -z_value,
+            "variables": {v: float(p.varValue or 0.0) for v, p in zip(var_names, pv)},
+            "iterations": 0,
+            "equations_latex": self._generate_equations_latex(structural_constraints, var_names, symbols, A, b),
+            "steps": [],
+            "explanation": "Método Simplex (PuLP/CBC): solución óptima encontrada"
+        })
+
+    def _solve_sparse_revised(self, c: np.ndarray, A: np.ndarray, b: np.ndarray, var_names: List[str],
+                              is_max: bool, structural_constraints: List[str],
+                              symbols: Dict[str, Any]) -> Dict[str, Any]:
+        """Simplex revisado con A dispersa (csc) y factorización LU dispersa de la base.
+        
+        Requiere b >= 0 para partir de la base de holguras; usa la regla de Bland.
+        """
+        from scipy import sparse
+        from scipy.sparse.linalg import splu
+        
+        m, n = A.shape
+        full = sparse.hstack([sparse.csc_matrix(A), sparse.identity(m, format='csc')], format='csc')
+        cost = np.concatenate([c, np.zeros(m)])
+        basis = np.arange(n, n + m)
+        
+        for iterations in range(50 * (m + n)):
+            lu = splu(full[:, basis])
+            x_basis = lu.solve(b)
+            # Precios duales y costos reducidos (c ya está en forma de maximización)
+            duals = lu.solve(cost[basis], trans='T')
+            candidates = np.flatnonzero(cost - full.T @ duals > self._TOL)
+            if candidates.size == 0:
+                break
+            entering = int(candidates[0])
+            
+            direction = lu.solve(full[:, entering].toarray().ravel())
+            positive = direction > self._TOL
+            if not positive.any():
+                return {"success": False, "error": "Problema ilimitado", "steps": []}
+            ratios = np.full(m, np.inf)
+            ratios[positive] = x_basis[positive] / direction[positive]
+            ties = np.flatnonzero(ratios <= ratios.min() + self._TOL)
+            basis[ties[np.argmin(basis[ties])]] = entering
+        else:
+            return {"success": False, "error": "Se alcanzó el máximo de iteraciones sin llegar a la solución óptima", "steps": []}
+        
+        x = np.zeros(n + m)
+        x[basis] = x_basis
+        z_value = float(cost @ x)
+        obj_value = z_value if is_max else -z_value
+        return self._convert_numpy_types({
+            "success": True,
+            "method": "simplex",
+            "status": "optimal",
+            "solver": "revised-splu",
+            "objective_value": obj_value,
+            "variables": {v: float(x[j]) for j, v in enumerate(var_names)},
+            "iterations": iterations,
+            "equations_latex": self._generate_equations_latex(structural_constraints, var_names, symbols, A, b),
+            "steps": [],
+            "explanation": f"Método Simplex revisado (matriz dispersa): {iterations} iteraciones hasta optimalidad"
+        })
 
     def _graphical_method(self, model: MathematicalModel) -> Dict[str, Any]:
         """Método gráfico para 2 variables con cálculo correcto de vértices y graficación."""
@@ -536,106 +891,87 @@ class SolverService:
                 return {"success": False, "error": "Método gráfico requiere exactamente 2 variables"}
             
             x_name, y_name = var_names[0], var_names[1]
-            x, y = sp.Symbol(x_name, real=True, positive=True), sp.Symbol(y_name, real=True, positive=True)
-            symbols = {x_name: x, y_name: y}
+            var_key = tuple(var_names)
+            symbols = _get_symbols(var_key)
             
-            # Parsear función objetivo
-            obj_expr = sp.sympify(model.objective_function, locals=symbols)
             is_max = model.objective == "max"
             
-            # Parsear restricciones estructurales
-            structural_constraints = self._filter_nonneg_constraints(model.constraints, var_names)
-            constraints_ineq = [self._parse_constraint(c, symbols) for c in structural_constraints]
-            constraints_ineq = [c for c in constraints_ineq if c]
-            
-            if not constraints_ineq:
-                feasible_points = [(0, 0)]
-            else:
-                vertices = {(0.0, 0.0)}
-                for lhs, op, rhs_val in constraints_ineq:
-                    # Intersecciones con ejes
-                    for var, fix_var, fix_val in [(x, y, 0), (y, x, 0)]:
-                        try:
-                            eq = lhs.subs(fix_var, fix_val) - rhs_val
-                            sol = sp.solve(eq, var)
-                            if sol:
-                                val = self._safe_float_conversion(sol[0])
-                                if val >= -self._TOL:
-                                    vertices.add((self._safe_float_conversion(sol[0]) if var == x else 0, 
-                                                 self._safe_float_conversion(sol[0]) if var == y else 0))
-                        except:
-                            pass
-                
-                # Intersecciones entre restricciones
-                for i, (lhs1, op1, rhs1) in enumerate(constraints_ineq):
-                    for lhs2, op2, rhs2 in constraints_ineq[i+1:]:
-                        try:
-                            sol = sp.solve([lhs1 - rhs1, lhs2 - rhs2], [x, y])
-                            if sol and isinstance(sol, dict):
-                                x_val, y_val = self._safe_float_conversion(sol.get(x, 0)), self._safe_float_conversion(sol.get(y, 0))
-                                if x_val >= -self._TOL and y_val >= -self._TOL:
-                                    vertices.add((x_val, y_val))
-                        except:
-                            pass
-                
-                # Filtrar vértices factibles
-                feasible_points = []
-                for v_x, v_y in vertices:
-                    is_feasible = v_x >= -self._TOL and v_y >= -self._TOL
-                    for lhs, op, rhs_val in constraints_ineq:
-                        val = self._safe_float_conversion(lhs.subs({x: v_x, y: v_y}))
-                        rhs_float = self._safe_float_conversion(rhs_val)
-                        if (op == "<=" and val > rhs_float + self._FEASIBLE_TOL) or \
-                           (op == ">=" and val < rhs_float - self._FEASIBLE_TOL) or \
-                           (op == "=" and abs(val - rhs_float) > self._FEASIBLE_TOL):
-                            is_feasible = False
-                            break
-                    if is_feasible:
-                        feasible_points.append((v_x, v_y))
-            
-            if not feasible_points:
-                return {"success": False, "error": "No hay región factible"}
-            
-            # Evaluar objetivo y encontrar óptimo
-            evaluated_points = []
-            best_value = best_point = None
-            for point in feasible_points:
-                obj_val = self._safe_float_conversion(obj_expr.subs({x: point[0], y: point[1]}))
-                evaluated_points.append({"point": point, "objective": obj_val, "is_optimal": False})
-                if best_value is None or (is_max and obj_val > best_value) or (not is_max and obj_val < best_value):
-                    best_value, best_point = obj_val, point
-            
-            for pt in evaluated_points:
-                if abs(pt["objective"] - best_value) < self._FEASIBLE_TOL and pt["point"] == best_point:
-                    pt["is_optimal"] = True
-                    break
-            
-            solution = {x_name: self._safe_float_conversion(best_point[0]), y_name: self._safe_float_conversion(best_point[1])}
-            
-            # Extraer información de restricciones y construir matrices A, b
+            # Parsear restricciones estructurales y construir matrices A, b
+            structural_constraints = list(self._context(model).structural)
             constraints_info = []
             A = np.zeros((len(structural_constraints), len(var_names)))
             b = np.zeros(len(structural_constraints))
+            ops, parsed_rows = [], []
             
             for idx, constraint_str in enumerate(structural_constraints):
-                parsed = self._parse_constraint(constraint_str, symbols)
+                parsed = linear_constraint(constraint_str, var_key)
                 if parsed:
-                    lhs, op, rhs_val = parsed
-                    a_coeff = self._safe_float_conversion(lhs.coeff(x, 1) or 0)
-                    b_coeff = self._safe_float_conversion(lhs.coeff(y, 1) or 0)
+                    (a_coeff, b_coeff), op, rhs_val = parsed
                     constraints_info.append({
                         "constraint": constraint_str,
                         "a": a_coeff,
                         "b": b_coeff,
-                        "rhs": self._safe_float_conversion(rhs_val),
+                        "rhs": rhs_val,
                         "operator": op
                     })
                     A[idx, 0] = a_coeff
                     A[idx, 1] = b_coeff
-                    b[idx] = self._safe_float_conversion(rhs_val)
+                    b[idx] = rhs_val
+                    ops.append(op)
+                    parsed_rows.append(idx)
+            
+            if not parsed_rows:
+                feasible_points = [(0, 0)]
+            else:
+                A_c, b_c = A[parsed_rows], b[parsed_rows]
+                sense = np.fromiter((_SENSE_CODE.get(op, 2) for op in ops), dtype=np.int64, count=len(ops))
+                
+                # Cortes con los ejes de todas las restricciones a la vez: (b/a, 0) y (0, b/c)
+                axis_vals = np.divide(b_c[:, None], A_c, out=np.full_like(A_c, -1.0), where=np.abs(A_c) > self._TOL)
+                axis_pts = np.zeros((len(b_c), 2, 2))
+                axis_pts[:, 0, 0] = axis_vals[:, 0]
+                axis_pts[:, 1, 1] = axis_vals[:, 1]
+                axis_pts = axis_pts.reshape(-1, 2)[(axis_vals >= -self._TOL).ravel()]
+                
+                # Intersecciones entre pares de restricciones: sistemas 2x2 resueltos en lote
+                i, j = np.triu_indices(len(b_c), k=1)
+                M = np.stack([A_c[i], A_c[j]], axis=1)
+                rhs = np.stack([b_c[i], b_c[j]], axis=1)
+                det = M[:, 0, 0] * M[:, 1, 1] - M[:, 0, 1] * M[:, 1, 0]
+                regular = np.abs(det) > self._TOL
+                pair_pts = np.linalg.solve(M[regular], rhs[regular][..., None])[..., 0] if regular.any() else np.empty((0, 2))
+                pair_pts = pair_pts[np.all(pair_pts >= -self._TOL, axis=1)]
+                
+                # Ajustar a una rejilla de 1e-9 y deduplicar: intersecciones casi idénticas por
+                # ruido de punto flotante cuentan como un solo vértice (y se reportan limpias)
+                cand = np.round(np.vstack([np.zeros((1, 2)), axis_pts, pair_pts]), 9) + 0.0
+                _, first = np.unique(cand, axis=0, return_index=True)
+                verts = cand[np.sort(first)]
+                
+                # Filtrar vértices factibles con un solo producto matricial
+                keep = _feasible_mask(verts, A_c, b_c, sense, self._FEASIBLE_TOL, self._TOL)
+                feasible_points = [tuple(v) for v in verts[keep].tolist()]
+            
+            if not feasible_points:
+                return {"success": False, "error": "No hay región factible"}
+            
+            # Evaluar objetivo en todos los vértices con una sola llamada a la función compilada
+            (cx, cy), _ = linear_coefficients(model.objective_function, var_key)
+            points = np.array(feasible_points, dtype=np.float64)
+            f_obj = _lambdify_objective(model.objective_function, var_key)
+            obj_vals = np.broadcast_to(np.asarray(f_obj(points[:, 0], points[:, 1]), dtype=np.float64), len(points))
+            best_idx = int(obj_vals.argmax() if is_max else obj_vals.argmin())
+            best_point, best_value = feasible_points[best_idx], float(obj_vals[best_idx])
+            
+            evaluated_points = [
+                {"point": point, "objective": float(obj_val), "is_optimal": i == best_idx}
+                for i, (point, obj_val) in enumerate(zip(feasible_points, obj_vals))
+            ]
+            
+            solution = {x_name: self._safe_float_conversion(best_point[0]), y_name: self._safe_float_conversion(best_point[1])}
             
             # Generar ecuaciones LaTeX con subíndices
-            equations_latex = self._generate_equations_latex_graphical(
+            equations_latex = self._generate_equations_latex(
                 structural_constraints, var_names, symbols, A, b
             ) if len(structural_constraints) > 0 else ""
             
@@ -650,8 +986,7 @@ class SolverService:
                 "constraints_info": constraints_info,
                 "equations_latex": equations_latex,
                 "steps": [],
-                "objective_coefficients": {x_name: self._safe_float_conversion(obj_expr.coeff(x, 1) or 0), 
-                                          y_name: self._safe_float_conversion(obj_expr.coeff(y, 1) or 0)},
+                "objective_coefficients": {x_name: cx, y_name: cy},
                 "explanation": f"Método Gráfico: Se evaluaron {len(feasible_points)} vértices de la región factible"
             }
             
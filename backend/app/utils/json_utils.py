@@ -0,0 +1,105 @@
+"""
+Utilidades de serialización JSON con soporte para tipos NumPy y SymPy.
+"""
+
+import json
+from functools import singledispatch
+from typing import Any, Dict, Iterable, Iterator, Tuple, Union
+
+import numpy as np
+import sympy as sp
+
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+
+@singledispatch
+def json_default(obj: Any) -> Any:
+    """Convierte en la serialización los tipos que json/orjson no manejan por sí solos.
+
+    Despacha por tipo (la resolución por MRO queda en caché por clase), así un valor SymPy
+    no recorre la cadena de isinstance de los tipos NumPy.
+
+    Args:
+        obj: Objeto no serializable de forma nativa
+
+    Returns:
+        Equivalente nativo de Python (lista, float, int, bool o str)
+    """
+    raise TypeError(f"Objeto de tipo {type(obj).__name__} no es serializable a JSON")
+
+
+@json_default.register
+def _(obj: np.ndarray) -> list:
+    return obj.tolist()
+
+
+@json_default.register
+def _(obj: np.floating) -> float:
+    return float(obj)
+
+
+@json_default.register
+def _(obj: np.integer) -> int:
+    return int(obj)
+
+
+@json_default.register
+def _(obj: np.bool_) -> bool:
+    return bool(obj)
+
+
+@json_default.register
+def _(obj: sp.Basic) -> str:
+    return str(obj)
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> str:
+    """Serializa a JSON convirtiendo NumPy en el propio encoder (orjson si está instalado).
+
+    Args:
+        obj: Estructura con dicts/listas que puede contener arreglos y escalares NumPy
+        sort_keys: Ordenar las claves (salida canónica, ej. para claves de caché)
+
+    Returns:
+        String JSON
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=json_default, option=option).decode("utf-8")
+    return json.dumps(obj, default=json_default, sort_keys=sort_keys)
+
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parsea JSON; con orjson los bytes del cuerpo HTTP se leen sin decodificarlos antes a str.
+
+    Args:
+        data: Documento JSON como bytes (UTF-8) o str
+
+    Returns:
+        Estructura Python equivalente
+
+    Raises:
+        json.JSONDecodeError si el documento no es JSON válido (orjson.JSONDecodeError hereda de ella)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def generate_ndjson(stream: Iterable[Tuple[str, Dict[str, Any]]]) -> Iterator[str]:
+    """Serializa cada evento (tipo, datos) del solver como una línea JSON (NDJSON).
+
+    Args:
+        stream: Eventos ("init" | "iter" | "final", datos) de SolverService.solve_simplex_stream
+
+    Returns:
+        Iterador de líneas terminadas en salto de línea
+    """
+    for kind, data in stream:
+        yield dumps({"event": kind, "data": data}) + "\n"
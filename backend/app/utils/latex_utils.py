@@ -2,31 +2,64 @@
 Utilidades para conversión de expresiones matemáticas a formato LaTeX.
 """
 
+import re
+import threading
+from functools import lru_cache
 import sympy as sp
-from typing import Optional, Dict
+from sympy.printing.latex import LatexPrinter
+from typing import Optional, Dict, Tuple
 from app.core.logger import logger
+from app.services.expression_utils import split_relation
+
+# Subíndices numéricos: x1 -> x_{1}
+_SUBSCRIPT = re.compile(r'([a-z])([0-9]+)')
+_OP_LATEX = {"<=": r"\leq", ">=": r"\geq", "=": "="}
+# Átomos cuyo LaTeX coincide con el texto (salvo subíndices): enteros sin ceros a la izquierda y
+# variables de una letra minúscula; nombres como "alpha" o "E" sí cambian al pasar por SymPy
+_ATOM = re.compile(r'^(?:-?[1-9][0-9]*|0|[a-z][0-9]*)$')
+
+# sp.latex construye un LatexPrinter (y sus settings) en cada llamada; se reutiliza uno por hilo
+# porque el printer guarda estado mutable (_context, _print_level) mientras imprime
+_PRINTERS = threading.local()
+
+
+def _latex_printer() -> LatexPrinter:
+    """LatexPrinter con la configuración por defecto, reutilizado dentro del hilo actual."""
+    printer = getattr(_PRINTERS, "printer", None)
+    if printer is None:
+        printer = _PRINTERS.printer = LatexPrinter()
+    return printer
 
 
 def format_expression_to_latex(expr_str: str) -> str:
     """Convierte expresión a LaTeX con subíndices numéricos para variables.
     
+    Memoizada por texto: el mismo modelo enviado de nuevo no vuelve a pasar por sympify/latex.
+    
     Args:
         expr_str: Expresión en formato SymPy como string
         
     Returns:
         String con la expresión en formato LaTeX
     """
+    # Se normalizan los espacios antes de consultar la caché para que " x1 + x2" y "x1 + x2" compartan entrada
+    return _expression_latex(expr_str.strip())
+
+
+@lru_cache(maxsize=4096)
+def _expression_latex(expr_str: str) -> str:
+    """Conversión memoizada de una expresión ya normalizada (ver format_expression_to_latex)."""
+    if _ATOM.match(expr_str):
+        return _SUBSCRIPT.sub(r'\1_{\2}', expr_str)
     try:
         expr = sp.sympify(expr_str)
-        latex_str = sp.latex(expr)
-        import re
-        latex_str = re.sub(r'([a-z])([0-9]+)', r'\1_{\2}', latex_str)
-        return latex_str
+        return _SUBSCRIPT.sub(r'\1_{\2}', _latex_printer().doprint(expr))
     except Exception as e:
         logger.warning(f"Error al convertir a LaTeX: {e}")
         return expr_str
 
 
+@lru_cache(maxsize=1024)
 def convert_constraint_to_latex(constraint_str: str) -> Optional[str]:
     """Convierte una restricción al formato LaTeX.
     
@@ -36,16 +69,14 @@ def convert_constraint_to_latex(constraint_str: str) -> Optional[str]:
     Returns:
         String en formato LaTeX o None si hay error
     """
+    parts = split_relation(constraint_str)
+    if parts is None:
+        return None
     try:
-        for op in ["<=", ">=", "="]:
-            if op in constraint_str:
-                parts = constraint_str.split(op, 1)
-                if len(parts) == 2:
-                    lhs_latex = format_expression_to_latex(parts[0].strip())
-                    rhs_latex = format_expression_to_latex(parts[1].strip())
-                    op_symbol = r"\leq" if op == "<=" else (r"\geq" if op == ">=" else "=")
-                    return f"{lhs_latex} {op_symbol} {rhs_latex}"
-                break
+        lhs, op, rhs = parts
+        lhs_latex = _expression_latex(lhs)
+        rhs_latex = _expression_latex(rhs)
+        return f"{lhs_latex} {_OP_LATEX[op]} {rhs_latex}"
     except Exception as e:
         logger.warning(f"Error al convertir restricción a LaTeX: {e}")
     return None
@@ -60,8 +91,11 @@ def generate_nonnegative_latex_conditions(variables: Dict[str, str]) -> list:
     Returns:
         Lista con condiciones de no-negatividad en LaTeX (una sola vez, sin duplicación)
     """
-    conditions = []
-    for i, var_name in enumerate(variables.keys(), 1):
-        base_name = var_name.rstrip('0123456789')
-        conditions.append(f"{base_name}_{{{i}}} \\geq 0")
-    return conditions
+    # Copia de la tupla memoizada: quien recibe la lista puede modificarla sin tocar la caché
+    return list(_nonnegative_conditions(tuple(variables)))
+
+
+@lru_cache(maxsize=256)
+def _nonnegative_conditions(var_names: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Condiciones de no-negatividad por nombres de variables (en orden; las descripciones no influyen)."""
+    return tuple(f"{var_name.rstrip('0123456789')}_{{{i}}} \\geq 0" for i, var_name in enumerate(var_names, 1))
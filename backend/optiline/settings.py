@@ -71,6 +71,9 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Procesos del pool que resuelve /solve (acotado: cada worker carga SymPy/NumPy)
+SOLVER_POOL_WORKERS = int(os.getenv('SOLVER_POOL_WORKERS', min(4, os.cpu_count() or 1)))
+
 # Reutilizar configuración existente para modelos Groq
 API_V1_STR = '/api/v1'
 PROJECT_NAME = 'Suite Optimizacion Lineal'
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Las pruebas se ejecutan desde backend/ sin instalar el paquete; la configuración exige PROJECT_NAME
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("PROJECT_NAME", "optiline-tests")
@@ -0,0 +1,140 @@
+"""
+Regresiones del parser de expresiones lineales y del filtrado de no negatividad.
+"""
+
+import numpy as np
+import pytest
+
+from app.schemas.analyze_schema import MathematicalModel
+from app.services.big_m_method import BigMMethod
+from app.services.dual_simplex_method import DualSimplexMethod
+from app.services.expression_utils import (
+    is_nonnegativity_bound, linear_coefficients, linear_constraint, split_relation
+)
+from app.utils.latex_utils import convert_constraint_to_latex
+from app.services.solver_service import SolverService
+
+
+def _model(objective_function, constraints, objective="max"):
+    return MathematicalModel(
+        objective=objective,
+        objective_function=objective_function,
+        variables={"x1": "x1", "x2": "x2"},
+        constraints=constraints,
+    )
+
+
+def test_upper_bound_at_zero_is_not_a_nonnegativity_bound():
+    var_names = ("x1", "x2")
+    assert is_nonnegativity_bound("x2 >= 0", var_names)
+    assert is_nonnegativity_bound("0 <= x2", var_names)
+    assert not is_nonnegativity_bound("x2 <= 0", var_names)
+
+
+@pytest.mark.parametrize("method", ["simplex", "graphical", "big_m", "interior_point"])
+def test_upper_bound_at_zero_is_enforced(method):
+    model = _model("x1 + 2*x2", ["x1 + x2 <= 4", "x2 <= 0", "x1 >= 0", "x2 >= 0"])
+    result = SolverService().solve(model, method=method)
+    assert result["success"]
+    assert result["objective_value"] == pytest.approx(4.0)
+    assert result["variables"]["x2"] == pytest.approx(0.0)
+
+
+def test_symbolic_coefficients_are_evaluated():
+    coeffs, const = linear_coefficients("E*x1 + sqrt(2)*x2 + pi", ("x1", "x2"))
+    assert coeffs == pytest.approx((2.718281828, 1.414213562))
+    assert const == pytest.approx(3.141592654)
+
+
+@pytest.mark.parametrize("objective_function", ["sqrt(2)*x1 + x2", "pi*x1 + x2"])
+def test_big_m_uses_symbolic_coefficients(objective_function):
+    model = _model(objective_function, ["x1 + x2 <= 4", "x1 <= 3", "x1 >= 0", "x2 >= 0"])
+    result = SolverService().solve(model, method="big_m")
+    assert result["success"]
+    assert result["variables"] == pytest.approx({"x1": 3.0, "x2": 1.0})
+
+
+@pytest.mark.parametrize("expr", ["2*x1*x2 + x1", "x1**2", "sin(x1)", "x1 + y"])
+def test_nonlinear_expressions_are_rejected(expr):
+    with pytest.raises(ValueError):
+        linear_coefficients(expr, ("x1", "x2"))
+
+
+@pytest.mark.parametrize("method", ["simplex", "big_m", "interior_point", "graphical"])
+def test_solve_rejects_nonlinear_model(method):
+    model = _model("x1*x2 + x2", ["x1 + x2 <= 4", "x1 >= 0", "x2 >= 0"])
+    service = SolverService()
+    suggested, not_applicable = service.determine_applicable_methods(model)
+    assert suggested == [] and method in not_applicable
+    result = service.solve(model, method=method)
+    assert not result["success"]
+    assert "no es lineal" in result["error"]
+
+
+def test_sparse_revised_matches_highs():
+    rng = np.random.default_rng(0)
+    n, m = 40, 40
+    A = np.where(rng.random((m, n)) < 0.1, rng.integers(1, 9, (m, n)), 0)
+    c = rng.integers(1, 9, n)
+    variables = {f"x{j + 1}": f"x{j + 1}" for j in range(n)}
+    constraints = [
+        " + ".join(f"{A[i, j]}*x{j + 1}" for j in np.flatnonzero(A[i])) + f" <= {rng.integers(10, 50)}"
+        for i in range(m) if A[i].any()
+    ]
+    objective_function = " + ".join(f"{c[j]}*x{j + 1}" for j in range(n))
+    for j in range(n):
+        constraints.append(f"x{j + 1} <= 5")
+    results = {}
+    for sparse_revised in (False, True):
+        model = MathematicalModel(objective="max", objective_function=objective_function, variables=variables,
+                                  constraints=constraints, metadata={"sparse_revised": sparse_revised})
+        results[sparse_revised] = SolverService().solve(model, method="simplex")
+    assert results[True]["solver"] == "revised-splu"
+    assert results[False]["solver"] == "highs-ds"
+    assert results[True]["objective_value"] == pytest.approx(results[False]["objective_value"])
+    assert results[False]["steps_omitted"] and "force_didactic" in results[False]["steps_note"]
+
+
+@pytest.mark.parametrize("constraint", ["x1 => 3", "x1 =< 3", "x1 < 3", "1 <= x1 <= 3", "x1 != 3"])
+def test_malformed_relations_are_rejected(constraint):
+    assert split_relation(constraint) is None
+    assert linear_constraint(constraint, ("x1", "x2")) is None
+    assert convert_constraint_to_latex(constraint) is None
+
+
+def test_linear_constraint_moves_variables_to_the_left():
+    assert linear_constraint("x1 + 2 <= 3*x2 + 10", ("x1", "x2")) == ((1.0, -3.0), "<=", 8.0)
+    assert linear_constraint("x1 == 3", ("x1", "x2")) == ((1.0, 0.0), "=", 3.0)
+
+
+def test_implicit_products_are_rejected_by_every_backend():
+    with pytest.raises(ValueError):
+        linear_coefficients("2x1 + x2", ("x1", "x2"))
+
+
+@pytest.mark.parametrize("constraint", ["x1*2*x2 <= 3", "x1*-x2 <= 3", "(x1)*x2 <= 3", "(x1+1)*(x2+1) <= 3"])
+def test_hidden_products_are_not_linear(constraint):
+    model = _model("x1 + x2", [constraint, "x1 <= 3", "x2 <= 3", "x1 >= 0", "x2 >= 0"])
+    service = SolverService()
+    suggested, _ = service.determine_applicable_methods(model)
+    assert suggested == []
+    result = service.solve(model, method="simplex")
+    assert not result["success"]
+    assert "no es lineal" in result["error"]
+
+
+@pytest.mark.parametrize("objective,method", [("max", "big_m"), ("min", "big_m"), ("min", "dual_simplex")])
+def test_methods_reject_nonlinear_constraint(objective, method):
+    model = _model("x1 + x2", ["x1*2*x2 >= 3", "x1 <= 3", "x2 <= 3", "x1 >= 0", "x2 >= 0"], objective=objective)
+    solver = BigMMethod() if method == "big_m" else DualSimplexMethod()
+    result = solver.solve(model)
+    assert not result["success"]
+    assert "no es lineal" in result["error"]
+
+
+def test_preset_context_is_used_only_for_its_model():
+    model = _model("3*x1 + 5*x2", ["x1 <= 4", "2*x2 <= 12", "3*x1 + 2*x2 <= 18", "x1 >= 0", "x2 >= 0"])
+    other = _model("x1 + x2", ["x1*x2 <= 3", "x1 >= 0", "x2 >= 0"])
+    service = SolverService(SolverService.model_context(model))
+    assert service.solve(model)["objective_value"] == pytest.approx(36.0)
+    assert "no es lineal" in service.solve(other)["error"]
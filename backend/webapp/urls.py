@@ -3,19 +3,22 @@ from . import views
 from django.conf import settings
 
 API_PREFIX = 'api/v1'
+_TEST = API_PREFIX + '/test/'
+_ANALYZE = API_PREFIX + '/analyze/'
 
 urlpatterns = [
     path('', views.home, name='home'),
 
     # Test endpoints
-    path(f'{API_PREFIX}/test/', views.test, name='api-test'),
-    path(f'{API_PREFIX}/test/health-check/', views.health_check, name='api-health-check'),
+    path(_TEST, views.test, name='api-test'),
+    path(_TEST + 'health-check/', views.health_check, name='api-health-check'),
 
     # Analyze endpoints
-    path(f'{API_PREFIX}/analyze/', views.analyze_problem, name='api-analyze'),
-    path(f'{API_PREFIX}/analyze/validate-model', views.validate_model, name='api-validate-model'),
-    path(f'{API_PREFIX}/analyze/get-representations', views.get_representations, name='api-get-representations'),
-    path(f'{API_PREFIX}/analyze/analyze-image', views.analyze_problem_from_image, name='api-analyze-image'),
-    path(f'{API_PREFIX}/analyze/solve', views.solve_model, name='api-solve'),
-    path(f'{API_PREFIX}/analyze/executive-report', views.generate_executive_report, name='api-executive-report'),
+    path(_ANALYZE, views.analyze_problem, name='api-analyze'),
+    path(_ANALYZE + 'validate-model', views.validate_model, name='api-validate-model'),
+    path(_ANALYZE + 'get-representations', views.get_representations, name='api-get-representations'),
+    path(_ANALYZE + 'analyze-image', views.analyze_problem_from_image, name='api-analyze-image'),
+    path(_ANALYZE + 'solve', views.solve_model, name='api-solve'),
+    path(_ANALYZE + 'solve-stream', views.solve_model_stream, name='api-solve-stream'),
+    path(_ANALYZE + 'executive-report', views.generate_executive_report, name='api-executive-report'),
 ]
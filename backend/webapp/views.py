@@ -1,12 +1,22 @@
+import asyncio
+import hashlib
 import json
-from typing import Optional, Dict, Any, Callable
-from django.http import JsonResponse, HttpRequest, HttpResponse
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Optional, Dict, Any, Callable, Tuple
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
 from django.views.decorators.http import require_GET, require_POST
 from django.views.decorators.csrf import csrf_exempt
 from django.shortcuts import render
-import sympy as sp
 
 from app.services.analyze_service import AnalyzeService
+from app.services.problem_transformer import ProblemTransformer
+from app.services.sensitivity_analysis import generate_executive_conclusion
+from app.services.solver_service import SolverService
 from app.schemas.analyze_schema import AnalyzeRequest, AnalyzeResponse, MathematicalModel
 from app.core.config import settings as fastapi_settings
 from app.core.logger import logger
@@ -15,62 +25,134 @@ from app.utils.latex_utils import (
     convert_constraint_to_latex,
     generate_nonnegative_latex_conditions
 )
+from app.utils.json_utils import dumps, generate_ndjson, loads
+from app.services.expression_utils import is_nonnegativity_bound
 
+__all__ = [
+    "home",
+    "test",
+    "health_check",
+    "analyze_problem",
+    "validate_model",
+    "get_representations",
+    "analyze_problem_from_image",
+    "solve_model",
+    "solve_model_stream",
+    "generate_executive_report",
+]
 
-class SymPyEncoder(json.JSONEncoder):
-    """Encoder personalizado para serializar objetos SymPy a strings."""
-    def default(self, obj: Any) -> Any:
-        if isinstance(obj, (sp.Basic, sp.Symbol)):
-            return str(obj)
-        return super().default(obj)
+# Representaciones y validación dependen solo del modelo: se guardan en la caché de Django por hash del payload
+_CACHE_TTL = 3600
 
+# Pool de procesos para el solver: un /solve largo no bloquea el hilo de la petición ni compite por el GIL.
+# Se crea con la primera petición y con 'spawn': los workers no heredan hilos ni conexiones del servidor
+_SOLVER_POOL: Optional[ProcessPoolExecutor] = None
+_SOLVER_POOL_LOCK = threading.Lock()
 
-def _is_nonnegative_constraint(constraint_str: str, variables: Dict[str, str]) -> bool:
-    """Verifica si una restricción es de no-negatividad."""
-    return any(f"{v} >= 0" in constraint_str.lower() or f"{v}<= 0" in constraint_str.lower() 
-               for v in variables.keys())
+# Comprobación O(1) de los métodos admitidos en minimización
+_MIN_ALLOWED = frozenset(SolverService.MIN_METHODS)
+
+
+def _solver_pool() -> ProcessPoolExecutor:
+    """Pool de procesos del solver, creado una sola vez aunque lleguen peticiones concurrentes."""
+    global _SOLVER_POOL
+    if _SOLVER_POOL is None:
+        with _SOLVER_POOL_LOCK:
+            if _SOLVER_POOL is None:
+                _SOLVER_POOL = ProcessPoolExecutor(max_workers=settings.SOLVER_POOL_WORKERS,
+                                                   mp_context=multiprocessing.get_context('spawn'))
+    return _SOLVER_POOL
+
+
+def _solve_worker(model: MathematicalModel, method: str, context: Tuple) -> Dict[str, Any]:
+    """Resuelve el modelo dentro de un proceso del pool (debe ser una función de módulo para poder serializarse).
+    
+    El contexto llega calculado desde el proceso web, donde ya lo memoizaron analyze/validate.
+    """
+    return SolverService(context).solve(model, method=method)
 
 
 def _build_canonical_form_with_latex(model: MathematicalModel) -> Dict[str, Any]:
     """Construye representación canónica con LaTeX sin duplicación de no-negatividad."""
-    constraints = [c for c in model.constraints if not _is_nonnegative_constraint(c, model.variables)]
+    variables = model.variables
+    objective_function = model.objective_function
+    constraints, constraints_latex = [], []
+    for c in model.constraints:
+        if is_nonnegativity_bound(c, variables):
+            continue
+        constraints.append(c)
+        constraints_latex.append(convert_constraint_to_latex(c) or c)
     return {
         "form": "canonical",
         "objective": model.objective,
-        "objective_function_latex": format_expression_to_latex(model.objective_function),
-        "objective_function": model.objective_function,
-        "constraints_latex": [convert_constraint_to_latex(c) or c for c in constraints],
+        "objective_function_latex": format_expression_to_latex(objective_function),
+        "objective_function": objective_function,
+        "constraints_latex": constraints_latex,
         "constraints": constraints,
-        "non_negativity_latex": generate_nonnegative_latex_conditions(model.variables),
-        "variables": model.variables
+        "non_negativity_latex": generate_nonnegative_latex_conditions(variables),
+        "variables": variables
     }
 
 
 def _handle_json_request(request: HttpRequest, schema_class: type) -> Optional[Any]:
-    """Helper para parsear JSON y validar con schema."""
+    """Helper para parsear JSON y validar con schema (el JSON mal formado propaga JSONDecodeError)."""
+    return _parse_schema(loads(request.body), schema_class)
+
+
+def _parse_schema(payload: Any, schema_class: type) -> Any:
+    """Valida un payload ya decodificado contra el schema."""
     try:
-        return schema_class(**json.loads(request.body.decode('utf-8')))
+        return schema_class(**payload)
     except Exception as e:
         logger.error(f"Error parseando JSON: {e}")
         raise ValueError(f"JSON inválido: {e}")
 
 
-def _json_response(data: Dict[str, Any], status: int = 200, **kwargs) -> JsonResponse:
-    """Helper para retornar respuestas JSON con SymPyEncoder."""
-    return JsonResponse(data, status=status, encoder=SymPyEncoder, **kwargs)
+def _cache_key(prefix: str, payload: Any) -> str:
+    """Clave de caché por contenido: JSON canónico (claves ordenadas) del payload ya decodificado."""
+    digest = hashlib.blake2b(dumps(payload, sort_keys=True).encode("utf-8"), digest_size=16)
+    return f"{prefix}:{digest.hexdigest()}"
+
+
+def _json_response(data: Any, status: int = 200, safe: bool = True) -> HttpResponse:
+    """Helper para retornar respuestas JSON serializadas con orjson (NumPy/SymPy incluidos)."""
+    if safe and not isinstance(data, dict):
+        raise TypeError("Para serializar objetos que no son dict usar safe=False")
+    return HttpResponse(dumps(data), status=status, content_type="application/json")
+
+
+@lru_cache(maxsize=32)
+def _detail_body(detail: str) -> str:
+    """Cuerpo {"detail": ...} de un mensaje de error fijo, serializado una sola vez."""
+    return dumps({"detail": detail})
+
+
+def _detail_response(detail: str, status: int) -> HttpResponse:
+    """Respuesta de error con mensaje fijo (no usar con mensajes que interpolan datos de la petición)."""
+    return HttpResponse(_detail_body(detail), status=status, content_type="application/json")
+
+
+def _invalid_json_response(error: json.JSONDecodeError) -> HttpResponse:
+    """Respuesta 400 para cuerpos que no son JSON válido (antes caían en el 500 genérico)."""
+    logger.error(f"JSON mal formado: {error}")
+    return _json_response({'detail': f'JSON inválido: {error}'}, status=400)
 
 
 def _add_latex_to_response(response_dict: Dict[str, Any], model: MathematicalModel) -> None:
-    """Agrega datos LaTeX a respuesta existente."""
+    """Agrega datos LaTeX a respuesta existente (no genera LaTeX si no hay dónde ponerlo)."""
+    math_model = response_dict.get("mathematical_model")
+    canonical = response_dict.get("representations", {}).get("canonical")
+    if not math_model and not canonical:
+        return
     canonical_latex = _build_canonical_form_with_latex(model)
-    if response_dict.get("mathematical_model"):
-        response_dict["mathematical_model"].update({
+    if math_model:
+        math_model.update({
             "objective_function_latex": canonical_latex.get("objective_function_latex"),
             "constraints_latex": canonical_latex.get("constraints_latex"),
             "non_negativity_latex": canonical_latex.get("non_negativity_latex")
         })
-    if response_dict.get("representations", {}).get("canonical"):
-        response_dict["representations"]["canonical"].update(canonical_latex)
+    if canonical:
+        canonical.update(canonical_latex)
 
 
 @require_GET
@@ -80,26 +162,26 @@ def home(request: HttpRequest) -> HttpResponse:
 
 
 @require_GET
-def test(request: HttpRequest) -> JsonResponse:
+def test(request: HttpRequest) -> HttpResponse:
     """Endpoint de prueba."""
     return _json_response({"message": "Test done"})
 
 
 @require_GET
-def health_check(request: HttpRequest) -> JsonResponse:
+def health_check(request: HttpRequest) -> HttpResponse:
     """Verifica el estado de la aplicación."""
     return _json_response(True, safe=False)
 
 
 @csrf_exempt
 @require_POST
-def analyze_problem(request: HttpRequest) -> JsonResponse:
+def analyze_problem(request: HttpRequest) -> HttpResponse:
     """Analiza un problema de optimización lineal."""
     try:
         analyze_req = _handle_json_request(request, AnalyzeRequest)
         api_key = analyze_req.api_key or fastapi_settings.GROQ_API_KEY
         if not api_key:
-            return _json_response({"detail": "API key requerida"}, status=401)
+            return _detail_response("API key requerida", status=401)
         
         service = AnalyzeService(groq_api_key=api_key)
         response = service.analyze_problem(
@@ -109,36 +191,44 @@ def analyze_problem(request: HttpRequest) -> JsonResponse:
         )
         
         if not response:
-            return _json_response({"detail": "Error al procesar el problema"}, status=500)
+            return _detail_response("Error al procesar el problema", status=500)
         
-        service.validate_model_with_sympy(response.mathematical_model)
-        representations_dict = service.get_problem_representations()
-        if representations_dict:
-            from app.schemas.analyze_schema import ProblemRepresentations
-            response.representations = ProblemRepresentations(**representations_dict)
+        model = response.mathematical_model
+        service.finalize(response)
         
-        response_dict = json.loads(response.model_dump_json())
-        _add_latex_to_response(response_dict, response.mathematical_model)
+        response_dict = response.model_dump(mode="json", exclude_none=True)
+        _add_latex_to_response(response_dict, model)
         
         return _json_response(response_dict)
+    except json.JSONDecodeError as e:
+        return _invalid_json_response(e)
     except Exception as e:
         logger.error(f"Error en analyze_problem: {e}")
-        return _json_response({"detail": "Error interno del servidor"}, status=500)
+        return _detail_response("Error interno del servidor", status=500)
 
 
 @csrf_exempt
 @require_POST
-def validate_model(request: HttpRequest) -> JsonResponse:
+def validate_model(request: HttpRequest) -> HttpResponse:
     """Valida un modelo matemático con SymPy."""
     try:
-        math_model = _handle_json_request(request, MathematicalModel)
-        service = AnalyzeService(groq_api_key='dummy')
-        is_valid = service.validate_model_with_sympy(math_model)
-        return _json_response({
+        # El mismo modelo siempre produce la misma respuesta: se reutilizan los bytes ya serializados
+        payload = loads(request.body)
+        key = _cache_key("validate", payload)
+        body = cache.get(key)
+        if body is not None:
+            return HttpResponse(body, content_type="application/json")
+        math_model = _parse_schema(payload, MathematicalModel)
+        is_valid = AnalyzeService.validate_model_with_sympy(math_model)
+        response = _json_response({
             'is_valid': is_valid,
-            'sympy_expressions': service.generate_sympy_expression(math_model),
+            'sympy_expressions': AnalyzeService.generate_sympy_expression(math_model),
             'message': 'Modelo validado correctamente' if is_valid else 'Error en validación'
         })
+        cache.set(key, response.content, timeout=_CACHE_TTL)
+        return response
+    except json.JSONDecodeError as e:
+        return _invalid_json_response(e)
     except Exception as e:
         logger.error(f"Error validando modelo: {e}")
         return _json_response({'detail': f'Error en validación: {e}'}, status=400)
@@ -146,13 +236,18 @@ def validate_model(request: HttpRequest) -> JsonResponse:
 
 @csrf_exempt
 @require_POST
-def get_representations(request: HttpRequest) -> JsonResponse:
+def get_representations(request: HttpRequest) -> HttpResponse:
     """Genera todas las representaciones de un modelo."""
     try:
-        model_dict = json.loads(request.body.decode('utf-8'))
-        from app.services.problem_transformer import ProblemTransformer
-        representations = ProblemTransformer(model_dict).get_all_representations()
+        model_dict = loads(request.body)
+        key = _cache_key("repr", model_dict)
+        representations = cache.get(key)
+        if representations is None:
+            representations = ProblemTransformer(model_dict).get_all_representations()
+            cache.set(key, representations, timeout=_CACHE_TTL)
         return _json_response({'success': True, 'representations': representations})
+    except json.JSONDecodeError as e:
+        return _invalid_json_response(e)
     except Exception as e:
         logger.error(f"Error generando representaciones: {e}")
         return _json_response({'detail': f'Error al generar representaciones: {e}'}, status=400)
@@ -160,69 +255,75 @@ def get_representations(request: HttpRequest) -> JsonResponse:
 
 @csrf_exempt
 @require_POST
-def analyze_problem_from_image(request: HttpRequest) -> JsonResponse:
+def analyze_problem_from_image(request: HttpRequest) -> HttpResponse:
     """Analiza un problema desde una imagen."""
     try:
         if 'file' not in request.FILES:
-            return _json_response({'detail': 'Imagen requerida'}, status=400)
+            return _detail_response('Imagen requerida', status=400)
         
         image_file = request.FILES['file']
         if not image_file.content_type or not image_file.content_type.startswith('image/'):
-            return _json_response({'detail': 'El archivo debe ser una imagen'}, status=400)
+            return _detail_response('El archivo debe ser una imagen', status=400)
         
         api_key = request.POST.get('api_key') or fastapi_settings.GROQ_API_KEY
         if not api_key:
-            return _json_response({'detail': 'API key requerida'}, status=401)
+            return _detail_response('API key requerida', status=401)
         
         service = AnalyzeService(groq_api_key=api_key)
         response = service.analyze_problem_from_image(
-            image_data=image_file.read(),
+            image_data=image_file,
             problem_description=request.POST.get('problem_description'),
             groq_model=None,
             prompt_name='basic'
         )
         
         if not response:
-            return _json_response({'detail': 'Error al procesar la imagen'}, status=500)
+            return _detail_response('Error al procesar la imagen', status=500)
         
-        service.validate_model_with_sympy(response.mathematical_model)
-        representations_dict = service.get_problem_representations()
-        if representations_dict:
-            from app.schemas.analyze_schema import ProblemRepresentations
-            response.representations = ProblemRepresentations(**representations_dict)
+        service.finalize(response)
         
-        return _json_response(json.loads(response.model_dump_json()))
+        return _json_response(response.model_dump(mode="json", exclude_none=True))
     except Exception as e:
         logger.error(f"Error en analyze_problem_from_image: {e}")
-        return _json_response({'detail': 'Error interno del servidor'}, status=500)
+        return _detail_response('Error interno del servidor', status=500)
 
 
 @csrf_exempt
 @require_POST
-def solve_model(request: HttpRequest) -> JsonResponse:
+async def solve_model(request: HttpRequest) -> HttpResponse:
     """Resuelve un modelo matemático con el método seleccionado."""
     try:
-        payload = json.loads(request.body.decode('utf-8'))
+        payload = loads(request.body)
         model_dict = payload.get('model')
         if not model_dict:
-            return _json_response({'detail': "Falta campo 'model' en payload"}, status=400)
+            return _detail_response("Falta campo 'model' en payload", status=400)
         
         model = MathematicalModel(**model_dict)
         method = payload.get('method', 'simplex')
+        if method not in SolverService.SUPPORTED_METHODS:
+            return _json_response({
+                'success': False,
+                'detail': f"Método no soportado: {method}",
+                'allowed_methods': list(SolverService.SUPPORTED_METHODS)
+            }, status=400)
         
         # Validación: problemas de minimización solo pueden usar dual_simplex, big_m o interior_point
-        if model.objective == "min" and method not in ["dual_simplex", "big_m", "interior_point"]:
+        if model.objective == "min" and method not in _MIN_ALLOWED:
             return _json_response({
                 'success': False,
                 'detail': f"Los problemas de minimización solo pueden resolverse con el Método Simplex Dual, el Método de la Gran M o el Método de Punto Interior. El método '{method}' no está disponible para minimización.",
-                'allowed_methods': ["dual_simplex", "big_m", "interior_point"],
+                'allowed_methods': list(SolverService.MIN_METHODS),
                 'objective_type': 'min'
             }, status=400)
         
-        from app.services.solver_service import SolverService
-        result = SolverService().solve(model, method=method)
+        loop = asyncio.get_running_loop()
+        # El contexto (barato y memoizado aquí) se calcula en el proceso web; sólo la resolución va al pool
+        result = await loop.run_in_executor(_solver_pool(), _solve_worker, model, method,
+                                            SolverService.model_context(model))
         
         return _json_response({'success': True, 'result': result})
+    except json.JSONDecodeError as e:
+        return _invalid_json_response(e)
     except Exception as e:
         logger.error(f"Error en solve_model: {str(e)}", exc_info=True)
         return _json_response({'detail': str(e)}, status=500)
@@ -230,7 +331,35 @@ def solve_model(request: HttpRequest) -> JsonResponse:
 
 @csrf_exempt
 @require_POST
-def generate_executive_report(request: HttpRequest) -> JsonResponse:
+def solve_model_stream(request: HttpRequest) -> HttpResponse:
+    """Resuelve con Simplex Tableau emitiendo cada iteración como una línea NDJSON."""
+    try:
+        payload = loads(request.body)
+        model_dict = payload.get('model')
+        if not model_dict:
+            return _detail_response("Falta campo 'model' en payload", status=400)
+        
+        model = MathematicalModel(**model_dict)
+        if model.objective == "min":
+            return _json_response({
+                'success': False,
+                'detail': "El streaming de iteraciones solo está disponible para el Método Simplex (maximización).",
+                'allowed_methods': ["simplex"],
+                'objective_type': 'min'
+            }, status=400)
+        
+        stream = SolverService().solve_simplex_stream(model)
+        return StreamingHttpResponse(generate_ndjson(stream), content_type='application/x-ndjson')
+    except json.JSONDecodeError as e:
+        return _invalid_json_response(e)
+    except Exception as e:
+        logger.error(f"Error en solve_model_stream: {str(e)}", exc_info=True)
+        return _json_response({'detail': str(e)}, status=500)
+
+
+@csrf_exempt
+@require_POST
+def generate_executive_report(request: HttpRequest) -> HttpResponse:
     """
     Genera un informe ejecutivo usando IA basado en los resultados del solver
     y el análisis de sensibilidad.
@@ -245,7 +374,7 @@ def generate_executive_report(request: HttpRequest) -> JsonResponse:
     }
     """
     try:
-        payload = json.loads(request.body.decode('utf-8'))
+        payload = loads(request.body)
         
         # Extraer datos del payload
         original_problem = payload.get('original_problem', '')
@@ -278,7 +407,6 @@ def generate_executive_report(request: HttpRequest) -> JsonResponse:
         variables_description = model_dict.get('variables', {})
         
         # Generar conclusión ejecutiva
-        from app.services.sensitivity_analysis import generate_executive_conclusion
         
         result = generate_executive_conclusion(
             original_problem=original_problem,
@@ -292,6 +420,8 @@ def generate_executive_report(request: HttpRequest) -> JsonResponse:
         
         return _json_response(result)
         
+    except json.JSONDecodeError as e:
+        return _invalid_json_response(e)
     except Exception as e:
         logger.error(f"Error en generate_executive_report: {str(e)}", exc_info=True)
         return _json_response({